@@ -24,6 +24,34 @@ app.config.update(
     UPLOAD_FOLDER=os.environ.get("UPLOAD_FOLDER", str(RUNTIME_DIR / "uploads")),
     DOWNLOAD_FOLDER=os.environ.get("DOWNLOAD_FOLDER", str(RUNTIME_DIR / "downloads")),
     OPENAI_MODEL=os.environ.get("OPENAI_MODEL", "gpt-5.2"),
+    SQLITE_SYNCHRONOUS=os.environ.get("SQLITE_SYNCHRONOUS", "NORMAL"),
+    SQLITE_BUSY_TIMEOUT=int(os.environ.get("SQLITE_BUSY_TIMEOUT", "5000")),
+    SQLITE_CACHE_SIZE=int(os.environ.get("SQLITE_CACHE_SIZE", "-16000")),
+    SQLITE_MMAP_SIZE=int(os.environ.get("SQLITE_MMAP_SIZE", "134217728")),
+    SQLITE_TEMP_STORE=os.environ.get("SQLITE_TEMP_STORE", "MEMORY"),
+    SQLITE_SLOW_QUERY_MS=float(os.environ.get("SQLITE_SLOW_QUERY_MS", "200")),
+    PURGE_CHUNK_SIZE=int(os.environ.get("PURGE_CHUNK_SIZE", "5000")),
+    REGRADE_CHUNK_SIZE=int(os.environ.get("REGRADE_CHUNK_SIZE", "5000")),
+    RESPONSE_STORAGE_MODE=os.environ.get("RESPONSE_STORAGE_MODE", "rows"),
+    WRITE_COORDINATOR_ENABLED=os.environ.get("WRITE_COORDINATOR_ENABLED", "1") != "0",
+    WRITE_BATCH_SIZE=int(os.environ.get("WRITE_BATCH_SIZE", "64")),
+    WRITE_BATCH_MAX_DELAY_MS=float(os.environ.get("WRITE_BATCH_MAX_DELAY_MS", "5")),
+    WRITE_COORDINATOR_TIMEOUT=float(os.environ.get("WRITE_COORDINATOR_TIMEOUT", "30")),
+    RECOMMENDATION_EXECUTOR_ENABLED=os.environ.get("RECOMMENDATION_EXECUTOR_ENABLED", "1") != "0",
+    RECOMMENDATION_COALESCE_MS=float(os.environ.get("RECOMMENDATION_COALESCE_MS", "250")),
+    RECOMMENDATION_WAIT_MS=float(os.environ.get("RECOMMENDATION_WAIT_MS", "1000")),
+    AI_RECOMMENDATION_HISTORY_LIMIT=int(os.environ.get("AI_RECOMMENDATION_HISTORY_LIMIT", "20")),
+    AI_RECOMMENDATION_HISTORY_COMPRESS=os.environ.get("AI_RECOMMENDATION_HISTORY_COMPRESS", "1") != "0",
+    AI_RECOMMENDATION_COMPACT_CHUNK_SIZE=max(int(os.environ.get("AI_RECOMMENDATION_COMPACT_CHUNK_SIZE", "500")), 1),
+    RECOMMENDATION_RECOMPUTE_CHUNK_SIZE=int(os.environ.get("RECOMMENDATION_RECOMPUTE_CHUNK_SIZE", "500")),
+    RECOMMENDATION_RECOMPUTE_WORKERS=int(os.environ.get("RECOMMENDATION_RECOMPUTE_WORKERS", "0")),
+    BACKUP_FOLDER=os.environ.get("BACKUP_FOLDER"),
+    BACKUP_INTERVAL_MINUTES=float(os.environ.get("BACKUP_INTERVAL_MINUTES", "60")),
+    BACKUP_RETENTION=int(os.environ.get("BACKUP_RETENTION", "24")),
+    BACKUP_PAGES_PER_STEP=int(os.environ.get("BACKUP_PAGES_PER_STEP", "256")),
+    BACKUP_STEP_SLEEP_MS=float(os.environ.get("BACKUP_STEP_SLEEP_MS", "5")),
+    ADMIN_REPORTS_FROM_SNAPSHOT=os.environ.get("ADMIN_REPORTS_FROM_SNAPSHOT", "0") == "1",
+    TOPIC_BANK_CACHE_SIZE=int(os.environ.get("TOPIC_BANK_CACHE_SIZE", "256")),
 )
 
 init_db(app)
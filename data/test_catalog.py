@@ -1,3 +1,9 @@
+import hashlib
+import re
+from functools import lru_cache
+from pathlib import Path
+
+
 TOPIC_DISPLAY_NAMES = {
     "Aptitude": "Aptitude",
     "Logical": "Logical Reasoning",
@@ -545,6 +551,73 @@ COMPANY_TEST_SEED = {
 }
 
 
+TOPIC_CATEGORY_PATTERNS = {
+    "Aptitude": {
+        "Time & Work": ["work", "pipe", "tank", "days", "finish"],
+        "Percentages": ["percent", "%", "discount", "interest"],
+        "Speed & Distance": ["train", "speed", "distance", "km", "hours"],
+        "Average & Ratio": ["average", "ratio", "class", "boys", "girls"],
+    },
+    "Logical": {
+        "Series & Patterns": ["series", "next", "missing term"],
+        "Coding-Decoding": ["code", "coded", "written as"],
+        "Directions & Arrangements": ["east", "west", "north", "south", "row"],
+        "Syllogisms & Relations": ["all", "some", "related", "conclusion", "photograph"],
+    },
+    "Logical Reasoning": {
+        "Series & Patterns": ["series", "next", "missing term"],
+        "Coding-Decoding": ["code", "coded", "written as"],
+        "Directions & Arrangements": ["east", "west", "north", "south", "row"],
+        "Syllogisms & Relations": ["all", "some", "related", "conclusion", "photograph"],
+    },
+    "Verbal": {
+        "Grammar": ["grammar", "grammatically", "fill in the blank", "sentence", "verb"],
+        "Vocabulary": ["synonym", "antonym", "meaning", "word closest"],
+        "Usage & Idioms": ["idiom", "usage", "punctuation", "correctly spelled"],
+    },
+    "Verbal Ability": {
+        "Grammar": ["grammar", "grammatically", "fill in the blank", "sentence", "verb"],
+        "Vocabulary": ["synonym", "antonym", "meaning", "word closest"],
+        "Usage & Idioms": ["idiom", "usage", "punctuation", "correctly spelled"],
+    },
+    "DSA Basics": {
+        "Data Structures": ["stack", "queue", "heap", "hash", "tree"],
+        "Algorithms": ["sort", "search", "merge", "dfs", "bfs"],
+        "Complexity": ["complexity", "worst-case", "average-case", "o("],
+    },
+    "SQL": {
+        "Joins & Aggregation": ["join", "group", "having", "count", "sum", "max"],
+        "DDL & DML": ["alter", "update", "delete", "truncate", "insert"],
+        "Filtering & Keys": ["where", "like", "primary key", "distinct", "filter"],
+    },
+}
+
+
+def _compile_category_matcher(topic_patterns):
+    branches = [
+        "(?=.*?(?:" + "|".join(re.escape(pattern) for pattern in patterns) + "))()"
+        for patterns in topic_patterns.values()
+    ]
+    return re.compile("|".join(branches), re.DOTALL), tuple(topic_patterns)
+
+
+TOPIC_CATEGORY_MATCHERS = {
+    topic_name: _compile_category_matcher(topic_patterns)
+    for topic_name, topic_patterns in TOPIC_CATEGORY_PATTERNS.items()
+}
+
+
+def infer_topic_category(topic_name, question_text):
+    matcher = TOPIC_CATEGORY_MATCHERS.get(topic_name)
+    if matcher is None and topic_name in {"Logical Reasoning", "Verbal Ability"}:
+        matcher = TOPIC_CATEGORY_MATCHERS.get("Logical" if topic_name == "Logical Reasoning" else "Verbal")
+    if matcher is None:
+        return topic_name
+    pattern, categories = matcher
+    match = pattern.match((question_text or "").lower())
+    return categories[match.lastindex - 1] if match else topic_name
+
+
 def get_question_difficulty(question_order, total_questions):
     if question_order <= max(2, total_questions // 3):
         return "Easy"
@@ -572,6 +645,7 @@ def build_topic_test_catalog():
                         "correct_answer": question["correct_answer"],
                         "explanation": question["explanation"],
                         "difficulty": get_question_difficulty(order, len(indexes)),
+                        "category": infer_topic_category(display_name, question["question_text"]),
                         "points": 1,
                     }
                 )
@@ -602,4 +676,15 @@ def build_topic_test_catalog():
     return catalog
 
 
-TOPIC_TEST_CATALOG = build_topic_test_catalog()
+CATALOG_FORMAT_VERSION = 2
+
+
+def topic_catalog_source_hash():
+    digest = hashlib.sha256(f"catalog-format-{CATALOG_FORMAT_VERSION}".encode("utf-8"))
+    digest.update(Path(__file__).read_bytes())
+    return digest.hexdigest()
+
+
+@lru_cache(maxsize=1)
+def get_topic_catalog():
+    return build_topic_test_catalog()
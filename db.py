@@ -1,13 +1,57 @@
+import hashlib
+import json
+import multiprocessing
+import os
+import queue
 import sqlite3
 import threading
+import time
+import zlib
+from collections import OrderedDict, deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from contextlib import closing, contextmanager
+from functools import lru_cache
+from itertools import chain, repeat
 from pathlib import Path
+from types import MappingProxyType
 
-from flask import current_app, g
+import click
+from flask import current_app, g, has_request_context, request
+from flask.cli import with_appcontext
 
-from data.test_catalog import COMPANY_TEST_SEED
+from data.test_catalog import COMPANY_TEST_SEED, TOPIC_CATEGORY_PATTERNS, get_topic_catalog, infer_topic_category, topic_catalog_source_hash
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 
 INITIALIZATION_LOCK = threading.Lock()
+CONNECTION_POOL = threading.local()
+QUERY_METRICS_LOCK = threading.Lock()
+QUERY_METRICS = {}
+SLOW_QUERY_LOG = deque(maxlen=100)
+COMPANY_CATALOG_LOCK = threading.Lock()
+COMPANY_CATALOG_CACHE = {}
+WRITE_COORDINATOR_LOCK = threading.Lock()
+WRITE_COORDINATORS = {}
+RECOMMENDATION_EXECUTOR_LOCK = threading.Lock()
+RECOMMENDATION_EXECUTORS = {}
+TOPIC_BANK_CACHE_LOCK = threading.Lock()
+TOPIC_BANK_CACHE = OrderedDict()
+TOPIC_BANK_CACHE_STATS = {"hits": 0, "misses": 0}
+
+SQLITE_SYNCHRONOUS_MODES = {"OFF", "NORMAL", "FULL", "EXTRA"}
+SQLITE_TEMP_STORE_MODES = {"DEFAULT", "FILE", "MEMORY"}
+RESPONSE_STORAGE_MODES = {"rows", "packed"}
+PACKED_ANSWER_CODES = "ABCD"
 
 CORE_TABLES_SQL = """
 CREATE TABLE IF NOT EXISTS users (
@@ -54,6 +98,7 @@ CREATE TABLE IF NOT EXISTS test_attempts (
     correct_answers INTEGER DEFAULT 0,
     time_taken INTEGER,
     completed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    packed_responses BLOB,
     FOREIGN KEY (user_id) REFERENCES users(id),
     FOREIGN KEY (section_id) REFERENCES test_sections(id)
 );
@@ -102,6 +147,7 @@ CREATE TABLE IF NOT EXISTS ai_recommendations (
     recommendation_payload TEXT,
     readiness_score DECIMAL(5,2) DEFAULT 0,
     generated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    payload_zlib BLOB,
     FOREIGN KEY (user_id) REFERENCES users(id)
 );
 
@@ -116,6 +162,7 @@ CREATE TABLE IF NOT EXISTS topic_test_attempts (
     correct_answers INTEGER DEFAULT 0,
     time_taken INTEGER DEFAULT 0,
     completed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    packed_responses BLOB,
     UNIQUE(user_id, test_key),
     FOREIGN KEY (user_id) REFERENCES users(id)
 );
@@ -161,6 +208,7 @@ CREATE TABLE IF NOT EXISTS company_test_questions (
     coding_output TEXT,
     difficulty TEXT DEFAULT "Medium",
     points INTEGER DEFAULT 1,
+    category TEXT,
     FOREIGN KEY (company_test_id) REFERENCES company_tests(id)
 );
 
@@ -169,8 +217,11 @@ CREATE TABLE IF NOT EXISTS company_test_attempts (
     user_id INTEGER NOT NULL,
     company_test_id INTEGER NOT NULL,
     score REAL,
+    correct_answers INTEGER,
+    total_questions INTEGER,
     time_taken INTEGER,
     completed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    packed_responses BLOB,
     FOREIGN KEY (user_id) REFERENCES users(id),
     FOREIGN KEY (company_test_id) REFERENCES company_tests(id)
 );
@@ -187,6 +238,231 @@ CREATE TABLE IF NOT EXISTS company_test_responses (
 );
 """
 
+SCHEMA_VERSION_SQL = """
+CREATE TABLE IF NOT EXISTS schema_version (
+    version INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+)
+"""
+
+HOT_QUERY_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS idx_questions_section ON questions (section_id)",
+    "CREATE INDEX IF NOT EXISTS idx_test_attempts_user_section ON test_attempts (user_id, section_id, completed_at)",
+    "CREATE INDEX IF NOT EXISTS idx_user_responses_attempt ON user_responses (attempt_id)",
+    "CREATE INDEX IF NOT EXISTS idx_topic_test_responses_attempt ON topic_test_responses (attempt_id)",
+    "CREATE INDEX IF NOT EXISTS idx_company_tests_company ON company_tests (company_id, test_name)",
+    "CREATE INDEX IF NOT EXISTS idx_company_test_questions_test ON company_test_questions (company_test_id)",
+    "CREATE INDEX IF NOT EXISTS idx_company_test_attempts_user_test ON company_test_attempts (user_id, company_test_id, completed_at)",
+    "CREATE INDEX IF NOT EXISTS idx_company_test_responses_attempt ON company_test_responses (attempt_id)",
+    "CREATE INDEX IF NOT EXISTS idx_ai_recommendations_user ON ai_recommendations (user_id, generated_at)",
+]
+
+USER_SECTION_STATS_SQL = """
+CREATE TABLE IF NOT EXISTS user_section_stats (
+    user_id INTEGER NOT NULL,
+    section_name TEXT NOT NULL,
+    score_sum REAL DEFAULT 0,
+    attempt_count INTEGER DEFAULT 0,
+    best_score REAL,
+    last_score REAL,
+    last_completed_at TIMESTAMP,
+    PRIMARY KEY (user_id, section_name),
+    FOREIGN KEY (user_id) REFERENCES users(id)
+)
+"""
+
+RECOMMENDATION_STATS_SQL = """
+CREATE TABLE IF NOT EXISTS user_recommendation_totals (
+    user_id INTEGER PRIMARY KEY,
+    attempt_count INTEGER DEFAULT 0,
+    score_sum REAL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (user_id) REFERENCES users(id)
+);
+
+CREATE TABLE IF NOT EXISTS user_recommendation_stats (
+    user_id INTEGER NOT NULL,
+    dimension TEXT NOT NULL,
+    name TEXT NOT NULL,
+    correct INTEGER DEFAULT 0,
+    total INTEGER DEFAULT 0,
+    last_missed_at TIMESTAMP,
+    PRIMARY KEY (user_id, dimension, name),
+    FOREIGN KEY (user_id) REFERENCES users(id)
+)
+"""
+
+RECOMMENDATION_STAT_DIMENSIONS = ("topic", "difficulty", "category")
+RECOMMENDATION_ROW_COLUMNS = (
+    "user_id", "source_type", "attempt_id", "topic_name", "test_name", "section_name", "category_name",
+    "question_text", "difficulty", "category", "is_correct", "score", "completed_at",
+)
+
+AI_RECOMMENDATION_LATEST_SQL = """
+CREATE TABLE IF NOT EXISTS ai_recommendation_latest (
+    user_id INTEGER PRIMARY KEY,
+    id INTEGER,
+    weak_sections TEXT,
+    improvement_areas TEXT,
+    practice_focus TEXT,
+    recommendation_payload TEXT,
+    readiness_score DECIMAL(5,2) DEFAULT 0,
+    generated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (user_id) REFERENCES users(id)
+)
+"""
+
+ADMIN_SUMMARY_TABLES_SQL = """
+CREATE TABLE IF NOT EXISTS student_summaries (
+    user_id INTEGER PRIMARY KEY,
+    total_attempts INTEGER DEFAULT 0,
+    score_sum REAL DEFAULT 0,
+    test_attempts INTEGER DEFAULT 0,
+    topic_attempts INTEGER DEFAULT 0,
+    company_attempts INTEGER DEFAULT 0,
+    sections_attempted INTEGER DEFAULT 0,
+    last_attempt_at TIMESTAMP,
+    FOREIGN KEY (user_id) REFERENCES users(id)
+);
+
+CREATE TABLE IF NOT EXISTS department_summaries (
+    department TEXT PRIMARY KEY,
+    student_count INTEGER DEFAULT 0,
+    total_attempts INTEGER DEFAULT 0,
+    score_sum REAL DEFAULT 0
+);
+"""
+
+SECTION_SCORE_HISTORY_SQL = """
+SELECT ta.id AS attempt_id, ta.user_id AS user_id, 'test' AS attempt_kind, ts.section_name AS section_name, ta.score AS score, ta.completed_at AS completed_at
+FROM test_attempts ta
+JOIN test_sections ts ON ta.section_id = ts.id
+UNION ALL
+SELECT tta.id, tta.user_id, 'topic', tta.topic_name, tta.score, tta.completed_at
+FROM topic_test_attempts tta
+UNION ALL
+SELECT cta.id, cta.user_id, 'company', c.company_name || ' Company Tests', cta.score, cta.completed_at
+FROM company_test_attempts cta
+JOIN company_tests ct ON cta.company_test_id = ct.id
+JOIN companies c ON ct.company_id = c.id
+"""
+
+SEED_STATE_SQL = """
+CREATE TABLE IF NOT EXISTS seed_state (
+    seed_name TEXT PRIMARY KEY,
+    fingerprint TEXT NOT NULL,
+    applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+)
+"""
+
+MAINTENANCE_JOBS_SQL = """
+CREATE TABLE IF NOT EXISTS maintenance_jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_type TEXT NOT NULL,
+    status TEXT NOT NULL,
+    progress TEXT,
+    error TEXT,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    started_at TIMESTAMP,
+    finished_at TIMESTAMP,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+)
+"""
+
+ANSWER_KEY_SOURCES = {
+    "test": ("questions", "section_id", "id"),
+    "topic": ("topic_bank_questions", "test_id", "question_key"),
+    "company": ("company_test_questions", "company_test_id", "id"),
+}
+
+TOPIC_BANK_TABLES_SQL = """
+CREATE TABLE IF NOT EXISTS topic_bank_topics (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    topic_key TEXT UNIQUE NOT NULL,
+    topic_name TEXT NOT NULL,
+    topic_source TEXT,
+    description TEXT,
+    test_count INTEGER DEFAULT 0,
+    sort_order INTEGER DEFAULT 0,
+    content_hash TEXT
+);
+
+CREATE TABLE IF NOT EXISTS topic_bank_tests (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    test_key TEXT UNIQUE NOT NULL,
+    topic_id INTEGER NOT NULL,
+    test_name TEXT NOT NULL,
+    description TEXT,
+    time_limit INTEGER,
+    sort_order INTEGER DEFAULT 0,
+    content_hash TEXT,
+    FOREIGN KEY (topic_id) REFERENCES topic_bank_topics(id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_topic_bank_tests_topic ON topic_bank_tests (topic_id, sort_order);
+
+CREATE TABLE IF NOT EXISTS topic_bank_questions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    test_id INTEGER NOT NULL,
+    question_order INTEGER NOT NULL,
+    question_id TEXT NOT NULL,
+    question_key TEXT NOT NULL,
+    question_text TEXT NOT NULL,
+    option_a TEXT,
+    option_b TEXT,
+    option_c TEXT,
+    option_d TEXT,
+    correct_answer TEXT NOT NULL,
+    explanation TEXT,
+    difficulty TEXT DEFAULT 'Medium',
+    points INTEGER DEFAULT 1,
+    category TEXT,
+    UNIQUE(test_id, question_order),
+    FOREIGN KEY (test_id) REFERENCES topic_bank_tests(id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_topic_bank_questions_key ON topic_bank_questions (test_id, question_key);
+
+CREATE TABLE IF NOT EXISTS topic_bank_state (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    version INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+"""
+
+MAINTENANCE_JOB_STALE_MINUTES = 10
+SUMMARY_REBUILD_CHUNK_SIZE = 500
+
+
+class MaintenanceJobConflict(RuntimeError):
+    def __init__(self, job):
+        super().__init__(f"Maintenance job {job['id']} is still {job['status']}")
+        self.job = job
+
+
+PROTECTED_DEMO_USERS = ("admin", "student1")
+
+DEMO_DATA_PURGE_ATTEMPT_STEPS = [
+    ("test_attempts", "user_responses"),
+    ("topic_test_attempts", "topic_test_responses"),
+    ("company_test_attempts", "company_test_responses"),
+]
+
+DEMO_DATA_PURGE_STEPS = [
+    "resumes",
+    "user_recommendation_stats",
+    "user_recommendation_totals",
+    "ai_recommendations",
+    "ai_recommendation_latest",
+]
+
+PACKED_RESPONSE_SOURCES = {
+    "test": ("test_attempts", "section_id", "user_responses", "question_id"),
+    "topic": ("topic_test_attempts", "test_key", "topic_test_responses", "question_key"),
+    "company": ("company_test_attempts", "company_test_id", "company_test_responses", "question_id"),
+}
+
 DEFAULT_TEST_SECTIONS = [
     ("Aptitude", "Quantitative and analytical reasoning", 15, 20),
     ("Logical Reasoning", "Pattern recognition and logical thinking", 15, 20),
@@ -239,7 +515,75 @@ DEFAULT_COMPANY_TESTS = [
 
 def init_app(app):
     app.before_request(ensure_database_initialized)
+    app.before_request(ensure_backup_scheduler)
     app.teardown_appcontext(close_db)
+    app.cli.add_command(rebuild_stats_command)
+    app.cli.add_command(pack_responses_command)
+    app.cli.add_command(compact_recommendations_command)
+    app.cli.add_command(recompute_recommendations_command)
+    app.cli.add_command(backup_database_command)
+    app.cli.add_command(import_topic_bank_command)
+
+
+@click.command("rebuild-stats")
+@with_appcontext
+def rebuild_stats_command():
+    rebuild_summary_tables()
+    click.echo("Rebuilt user_section_stats, student_summaries and department_summaries from attempt history and reset recommendation counters.")
+
+
+@click.command("pack-responses")
+@click.option("--chunk-size", default=500, show_default=True, type=int)
+@with_appcontext
+def pack_responses_command(chunk_size):
+    for kind, counts in pack_stored_responses(chunk_size).items():
+        click.echo(f"{kind}: packed {counts['packed']} attempts, left {counts['skipped']} in row storage.")
+
+
+@click.command("compact-recommendations")
+@click.option("--chunk-size", default=500, show_default=True, type=click.IntRange(min=1))
+@with_appcontext
+def compact_recommendations_command(chunk_size):
+    ensure_database_initialized()
+    progress = compact_ai_recommendation_history(chunk_size)
+    click.echo(
+        f"Scanned {progress['users_scanned']} users: trimmed {progress['rows_deleted']} history rows, "
+        f"compressed {progress['rows_compressed']}, restored {progress['latest_restored']} latest rows."
+    )
+
+
+@click.command("recompute-recommendations")
+@click.option("--chunk-size", default=500, show_default=True, type=int)
+@click.option("--workers", default=0, show_default=True, type=int, help="Worker processes; 0 uses RECOMMENDATION_RECOMPUTE_WORKERS or the CPU count.")
+@with_appcontext
+def recompute_recommendations_command(chunk_size, workers):
+    from utils import build_ai_recommendation_payload
+
+    ensure_database_initialized()
+    progress = recompute_all_recommendations(build_ai_recommendation_payload, chunk_size, workers)
+    click.echo(
+        f"Recomputed {progress['users_processed']} users ({progress['users_changed']} changed) from {progress['rows_streamed']} rows "
+        f"in {progress['elapsed_ms']} ms: {progress['users_per_second']} users/s on {progress['workers']} workers."
+    )
+
+
+@click.command("backup-db")
+@with_appcontext
+def backup_database_command():
+    ensure_database_initialized()
+    backup = create_database_backup()
+    click.echo(f"Wrote {backup['snapshot']} ({backup['size_bytes']} bytes) in {backup['elapsed_ms']} ms.")
+
+
+@click.command("import-topic-bank")
+@click.argument("catalog_file", type=click.Path(exists=True, dir_okay=False))
+@with_appcontext
+def import_topic_bank_command(catalog_file):
+    with open(catalog_file, encoding="utf-8") as handle:
+        catalog = json.load(handle)
+    with _write_transaction() as connection:
+        changed = sync_topic_bank(connection, catalog)
+    click.echo(f"Imported {changed} changed topics/tests; topic bank is now at version {get_topic_bank_version()}.")
 
 
 def ensure_database_initialized():
@@ -253,55 +597,486 @@ def ensure_database_initialized():
         database_path = Path(current_app.config["DATABASE_PATH"])
         database_path.parent.mkdir(parents=True, exist_ok=True)
 
-        with sqlite3.connect(database_path) as connection:
-            connection.row_factory = sqlite3.Row
-            connection.execute("PRAGMA foreign_keys = ON")
+        fingerprint = bootstrap_fingerprint()
+        if _stored_bootstrap_fingerprint(database_path) != fingerprint:
+            with _initialization_file_lock(database_path):
+                if _stored_bootstrap_fingerprint(database_path) != fingerprint:
+                    _bootstrap_database(database_path, fingerprint)
+
+        current_app.config["_DB_INITIALIZED"] = True
+
+
+@lru_cache(maxsize=1)
+def bootstrap_fingerprint():
+    payload = json.dumps(
+        {
+            "schema_version": SCHEMA_MIGRATIONS[-1][0],
+            "test_sections": DEFAULT_TEST_SECTIONS,
+            "questions": DEFAULT_QUESTIONS,
+            "users": DEFAULT_USERS,
+            "company_tests": COMPANY_TEST_SEED,
+            "topic_catalog": topic_catalog_source_hash(),
+        },
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def _stored_bootstrap_fingerprint(database_path):
+    connection = _acquire_pooled_connection(str(database_path), current_app.config)
+    try:
+        row = connection.execute("SELECT fingerprint FROM seed_state WHERE seed_name = 'bootstrap'").fetchone()
+    except sqlite3.OperationalError:
+        return None
+    return row["fingerprint"] if row else None
+
+
+@contextmanager
+def _initialization_file_lock(database_path):
+    lock_path = database_path.with_name(f"{database_path.name}.init.lock")
+    with open(lock_path, "a") as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _bootstrap_database(database_path, fingerprint):
+    with closing(_open_connection(str(database_path), current_app.config)) as connection:
+        with connection:
             connection.executescript(CORE_TABLES_SQL)
-            _ensure_resume_columns(connection)
+            connection.execute("BEGIN IMMEDIATE")
+            _run_schema_migrations(connection)
             _seed_test_sections(connection)
             _seed_questions(connection)
             _seed_default_users(connection)
             _seed_company_tests(connection)
             _seed_company_test_questions(connection)
-            connection.commit()
-
-        current_app.config["_DB_INITIALIZED"] = True
+            _seed_topic_bank(connection)
+            connection.execute(
+                "INSERT OR REPLACE INTO seed_state (seed_name, fingerprint, applied_at) VALUES ('bootstrap', ?, CURRENT_TIMESTAMP)",
+                (fingerprint,),
+            )
 
 
 def get_db():
     ensure_database_initialized()
     if "db_connection" not in g:
-        connection = sqlite3.connect(current_app.config["DATABASE_PATH"])
-        connection.row_factory = sqlite3.Row
-        connection.execute("PRAGMA foreign_keys = ON")
-        g.db_connection = connection
+        g.db_connection = _acquire_pooled_connection(current_app.config["DATABASE_PATH"], current_app.config)
     return g.db_connection
 
 
+def get_read_db():
+    ensure_database_initialized()
+    if "db_read_connection" not in g:
+        g.db_read_connection = _acquire_pooled_connection(current_app.config["DATABASE_PATH"], current_app.config, read_only=True)
+    return g.db_read_connection
+
+
+def _query_db():
+    if has_request_context() and request.method in {"GET", "HEAD"}:
+        return get_read_db()
+    return get_db()
+
+
 def close_db(_error=None):
-    connection = g.pop("db_connection", None)
-    if connection is not None:
+    for key in ("db_connection", "db_read_connection"):
+        connection = g.pop(key, None)
+        if connection is not None and connection.in_transaction:
+            connection.rollback()
+
+
+def _acquire_pooled_connection(database_path, config, read_only=False):
+    pool = CONNECTION_POOL.__dict__.setdefault("connections", {})
+    pool_key = (database_path, read_only)
+    pooled = pool.get(pool_key)
+    if pooled is not None:
+        owner_pid, connection = pooled
+        if owner_pid == os.getpid() and _connection_is_healthy(connection):
+            return connection
+        pool.pop(pool_key, None)
+        if owner_pid == os.getpid():
+            _close_quietly(connection)
+
+    connection = _open_connection(database_path, config, read_only)
+    pool[pool_key] = (os.getpid(), connection)
+    return connection
+
+
+def _open_connection(database_path, config, read_only=False):
+    timeout = int(config.get("SQLITE_BUSY_TIMEOUT", 5000)) / 1000
+    if read_only:
+        connection = sqlite3.connect(f"{Path(database_path).resolve().as_uri()}?mode=ro", timeout=timeout, uri=True)
+    else:
+        connection = sqlite3.connect(database_path, timeout=timeout)
+        connection.execute("PRAGMA journal_mode = WAL")
+    connection.row_factory = sqlite3.Row
+    _apply_connection_pragmas(connection, config)
+    if read_only:
+        connection.execute("PRAGMA query_only = ON")
+    return connection
+
+
+def _apply_connection_pragmas(connection, config):
+    synchronous = str(config.get("SQLITE_SYNCHRONOUS", "NORMAL")).upper()
+    temp_store = str(config.get("SQLITE_TEMP_STORE", "MEMORY")).upper()
+    if synchronous not in SQLITE_SYNCHRONOUS_MODES:
+        raise ValueError(f"Unsupported SQLITE_SYNCHRONOUS value: {synchronous}")
+    if temp_store not in SQLITE_TEMP_STORE_MODES:
+        raise ValueError(f"Unsupported SQLITE_TEMP_STORE value: {temp_store}")
+
+    connection.execute("PRAGMA foreign_keys = ON")
+    connection.execute(f"PRAGMA busy_timeout = {int(config.get('SQLITE_BUSY_TIMEOUT', 5000))}")
+    connection.execute(f"PRAGMA synchronous = {synchronous}")
+    connection.execute(f"PRAGMA cache_size = {int(config.get('SQLITE_CACHE_SIZE', -16000))}")
+    connection.execute(f"PRAGMA mmap_size = {int(config.get('SQLITE_MMAP_SIZE', 134217728))}")
+    connection.execute(f"PRAGMA temp_store = {temp_store}")
+
+
+def _connection_is_healthy(connection):
+    try:
+        if connection.in_transaction:
+            connection.rollback()
+        connection.execute("SELECT 1").fetchone()
+    except sqlite3.Error:
+        return False
+    return True
+
+
+def _close_quietly(connection):
+    try:
         connection.close()
+    except sqlite3.Error:
+        pass
 
 
-def _fetch_all(query, params=()):
-    cursor = get_db().execute(query, params)
-    return cursor.fetchall()
+def _fetch_all(query, params=(), connection=None):
+    started = time.perf_counter()
+    rows = (connection or _query_db()).execute(query, params).fetchall()
+    _record_query_timing(query, time.perf_counter() - started, len(rows))
+    return rows
 
 
 def _fetch_one(query, params=()):
-    cursor = get_db().execute(query, params)
-    return cursor.fetchone()
+    started = time.perf_counter()
+    row = _query_db().execute(query, params).fetchone()
+    _record_query_timing(query, time.perf_counter() - started, int(row is not None))
+    return row
+
+
+def _iter_rows(query, params=(), batch_size=500, connection=None):
+    started = time.perf_counter()
+    cursor = (connection or _query_db()).execute(query, params)
+    elapsed = time.perf_counter() - started
+    row_count = 0
+    while True:
+        started = time.perf_counter()
+        rows = cursor.fetchmany(batch_size)
+        elapsed += time.perf_counter() - started
+        if not rows:
+            break
+        row_count += len(rows)
+        yield from rows
+    _record_query_timing(query, elapsed, row_count)
 
 
 def _execute(query, params=()):
+    started = time.perf_counter()
     connection = get_db()
     cursor = connection.execute(query, params)
     connection.commit()
+    _record_query_timing(query, time.perf_counter() - started, cursor.rowcount)
     return cursor.lastrowid
 
 
-def _ensure_resume_columns(connection):
+def _record_query_timing(query, elapsed_seconds, row_count):
+    elapsed_ms = elapsed_seconds * 1000
+    statement = " ".join(query.split())
+    with QUERY_METRICS_LOCK:
+        metrics = QUERY_METRICS.setdefault(statement, {"calls": 0, "total_ms": 0.0, "max_ms": 0.0, "rows": 0})
+        metrics["calls"] += 1
+        metrics["total_ms"] += elapsed_ms
+        metrics["max_ms"] = max(metrics["max_ms"], elapsed_ms)
+        metrics["rows"] += max(row_count, 0)
+
+    threshold_ms = float(current_app.config.get("SQLITE_SLOW_QUERY_MS", 0))
+    if threshold_ms <= 0 or elapsed_ms < threshold_ms:
+        return
+    SLOW_QUERY_LOG.append({
+        "statement": statement,
+        "elapsed_ms": round(elapsed_ms, 3),
+        "rows": row_count,
+        "logged_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+    })
+    current_app.logger.warning("Slow SQL (%.1f ms, %s rows): %s", elapsed_ms, row_count, statement)
+
+
+def get_query_metrics(limit=25):
+    with QUERY_METRICS_LOCK:
+        statements = [
+            {
+                "statement": statement,
+                "calls": metrics["calls"],
+                "total_ms": round(metrics["total_ms"], 3),
+                "avg_ms": round(metrics["total_ms"] / metrics["calls"], 3),
+                "max_ms": round(metrics["max_ms"], 3),
+                "rows": metrics["rows"],
+            }
+            for statement, metrics in QUERY_METRICS.items()
+        ]
+        slow_queries = list(SLOW_QUERY_LOG)
+        write_batches = []
+        for (process_id, database_path), coordinator in WRITE_COORDINATORS.items():
+            if process_id != os.getpid():
+                continue
+            stats = coordinator["stats"]
+            write_batches.append({
+                "database_path": database_path,
+                "batches": stats["batches"],
+                "writes": stats["writes"],
+                "failed_writes": stats["failed_writes"],
+                "max_batch_size": stats["max_batch_size"],
+                "avg_batch_size": round(stats["writes"] / stats["batches"], 3) if stats["batches"] else 0,
+                "avg_batch_ms": round(stats["total_ms"] / stats["batches"], 3) if stats["batches"] else 0,
+                "queued": coordinator["queue"].qsize(),
+            })
+        recommendation_refreshes = []
+        for (process_id, database_path), executor in RECOMMENDATION_EXECUTORS.items():
+            if process_id != os.getpid():
+                continue
+            stats = executor["stats"]
+            recommendation_refreshes.append({
+                "database_path": database_path,
+                "requested": stats["requested"],
+                "coalesced": stats["coalesced"],
+                "runs": stats["runs"],
+                "failed_runs": stats["failed_runs"],
+                "avg_run_ms": round(stats["total_ms"] / stats["runs"], 3) if stats["runs"] else 0,
+                "queued": len(executor["pending"]),
+            })
+    statements.sort(key=lambda item: item["total_ms"], reverse=True)
+    return {
+        "process_id": os.getpid(),
+        "slow_query_threshold_ms": float(current_app.config.get("SQLITE_SLOW_QUERY_MS", 0)),
+        "statement_count": len(statements),
+        "statements": statements[:limit],
+        "slow_queries": slow_queries[::-1],
+        "write_batches": write_batches,
+        "recommendation_refreshes": recommendation_refreshes,
+    }
+
+
+@contextmanager
+def _write_transaction():
+    connection = get_db()
+    connection.execute("BEGIN IMMEDIATE")
+    try:
+        yield connection
+        connection.commit()
+    except Exception:
+        connection.rollback()
+        raise
+
+
+@contextmanager
+def _read_transaction():
+    connection = get_read_db()
+    connection.execute("BEGIN")
+    try:
+        yield connection
+    finally:
+        connection.rollback()
+
+
+def _submit_write(operation, *args):
+    if not current_app.config.get("WRITE_COORDINATOR_ENABLED", True):
+        with _write_transaction() as connection:
+            return operation(connection, *args)
+
+    future = Future()
+    _get_write_coordinator()["queue"].put((operation, args, future))
+    try:
+        return future.result(timeout=float(current_app.config.get("WRITE_COORDINATOR_TIMEOUT", 30)))
+    except FutureTimeoutError:
+        if future.cancel():
+            raise
+        return future.result()
+
+
+def _get_write_coordinator():
+    key = (os.getpid(), current_app.config["DATABASE_PATH"])
+    coordinator = WRITE_COORDINATORS.get(key)
+    if coordinator and coordinator["thread"].is_alive():
+        return coordinator
+
+    with WRITE_COORDINATOR_LOCK:
+        coordinator = WRITE_COORDINATORS.get(key)
+        if coordinator and coordinator["thread"].is_alive():
+            return coordinator
+        coordinator = {
+            "queue": queue.SimpleQueue(),
+            "stats": {"batches": 0, "writes": 0, "failed_writes": 0, "max_batch_size": 0, "total_ms": 0.0},
+        }
+        coordinator["thread"] = threading.Thread(
+            target=_run_write_coordinator,
+            args=(current_app._get_current_object(), coordinator),
+            name="sqlite-writer",
+            daemon=True,
+        )
+        coordinator["thread"].start()
+        WRITE_COORDINATORS[key] = coordinator
+    return coordinator
+
+
+def _run_write_coordinator(app, coordinator):
+    batch_size = max(int(app.config.get("WRITE_BATCH_SIZE", 64)), 1)
+    max_delay = max(float(app.config.get("WRITE_BATCH_MAX_DELAY_MS", 5)), 0) / 1000
+    with app.app_context():
+        while True:
+            batch = [coordinator["queue"].get()]
+            deadline = time.monotonic() + max_delay
+            while len(batch) < batch_size:
+                try:
+                    batch.append(coordinator["queue"].get(timeout=max(deadline - time.monotonic(), 0)))
+                except queue.Empty:
+                    break
+            _commit_write_batch(batch, coordinator["stats"])
+
+
+def _commit_write_batch(batch, stats):
+    batch = [job for job in batch if job[2].set_running_or_notify_cancel()]
+    if not batch:
+        return
+    started = time.perf_counter()
+    outcomes = []
+    try:
+        with _write_transaction() as connection:
+            for operation, args, future in batch:
+                connection.execute("SAVEPOINT write_job")
+                try:
+                    result = operation(connection, *args)
+                except Exception as error:
+                    connection.execute("ROLLBACK TO write_job")
+                    outcomes.append((future, None, error))
+                else:
+                    outcomes.append((future, result, None))
+                connection.execute("RELEASE write_job")
+    except Exception as error:
+        outcomes = [(future, None, error) for _operation, _args, future in batch]
+
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    with QUERY_METRICS_LOCK:
+        stats["batches"] += 1
+        stats["writes"] += len(batch)
+        stats["failed_writes"] += sum(1 for _future, _result, error in outcomes if error is not None)
+        stats["max_batch_size"] = max(stats["max_batch_size"], len(batch))
+        stats["total_ms"] += elapsed_ms
+
+    for future, result, error in outcomes:
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+
+def schedule_recommendation_refresh(user_id, generator):
+    if not current_app.config.get("RECOMMENDATION_EXECUTOR_ENABLED", True):
+        generator(user_id)
+        return
+
+    executor = _get_recommendation_executor()
+    with executor["condition"]:
+        executor["requested"][user_id] = executor["requested"].get(user_id, 0) + 1
+        executor["stats"]["requested"] += 1
+        if user_id in executor["pending"]:
+            executor["stats"]["coalesced"] += 1
+            return
+        executor["pending"][user_id] = generator
+    delay = max(float(current_app.config.get("RECOMMENDATION_COALESCE_MS", 250)), 0) / 1000
+    executor["queue"].put((time.monotonic() + delay, user_id))
+
+
+def wait_for_recommendation_refresh(user_id, timeout=None):
+    executor = RECOMMENDATION_EXECUTORS.get((os.getpid(), current_app.config["DATABASE_PATH"]))
+    if executor is None:
+        return True
+    if timeout is None:
+        timeout = max(float(current_app.config.get("RECOMMENDATION_WAIT_MS", 1000)), 0) / 1000
+    with executor["condition"]:
+        return executor["condition"].wait_for(
+            lambda: executor["completed"].get(user_id, 0) >= executor["requested"].get(user_id, 0),
+            timeout=timeout,
+        )
+
+
+def _get_recommendation_executor():
+    key = (os.getpid(), current_app.config["DATABASE_PATH"])
+    executor = RECOMMENDATION_EXECUTORS.get(key)
+    if executor and executor["thread"].is_alive():
+        return executor
+
+    with RECOMMENDATION_EXECUTOR_LOCK:
+        executor = RECOMMENDATION_EXECUTORS.get(key)
+        if executor and executor["thread"].is_alive():
+            return executor
+        executor = {
+            "queue": queue.SimpleQueue(),
+            "condition": threading.Condition(),
+            "pending": {},
+            "requested": {},
+            "completed": {},
+            "stats": {"requested": 0, "coalesced": 0, "runs": 0, "failed_runs": 0, "total_ms": 0.0},
+        }
+        executor["thread"] = threading.Thread(
+            target=_run_recommendation_executor,
+            args=(current_app._get_current_object(), executor),
+            name="recommendation-refresh",
+            daemon=True,
+        )
+        executor["thread"].start()
+        RECOMMENDATION_EXECUTORS[key] = executor
+    return executor
+
+
+def _run_recommendation_executor(app, executor):
+    while True:
+        due, user_id = executor["queue"].get()
+        time.sleep(max(due - time.monotonic(), 0))
+        with executor["condition"]:
+            generator = executor["pending"].pop(user_id)
+            target = executor["requested"][user_id]
+
+        started = time.perf_counter()
+        failed = False
+        try:
+            with app.app_context():
+                generator(user_id)
+        except Exception:
+            failed = True
+            app.logger.exception("Recommendation refresh for user %s failed", user_id)
+
+        with executor["condition"]:
+            executor["completed"][user_id] = max(executor["completed"].get(user_id, 0), target)
+            executor["stats"]["runs"] += 1
+            executor["stats"]["failed_runs"] += int(failed)
+            executor["stats"]["total_ms"] += (time.perf_counter() - started) * 1000
+            executor["condition"].notify_all()
+
+
+def _run_schema_migrations(connection):
+    connection.execute(SCHEMA_VERSION_SQL)
+    current_version = connection.execute("SELECT COALESCE(MAX(version), 0) FROM schema_version").fetchone()[0]
+    for version, name, migrate in SCHEMA_MIGRATIONS:
+        if version <= current_version:
+            continue
+        migrate(connection)
+        connection.execute("INSERT INTO schema_version (version, name) VALUES (?, ?)", (version, name))
+
+
+def _migrate_legacy_columns(connection):
     existing_columns = {row["name"] for row in connection.execute("PRAGMA table_info(resumes)").fetchall()}
     missing_columns = {
         "target_company": "ALTER TABLE resumes ADD COLUMN target_company TEXT",
@@ -322,6 +1097,112 @@ def _ensure_resume_columns(connection):
             connection.execute(statement)
 
 
+def _migrate_hot_query_indexes(connection):
+    for statement in HOT_QUERY_INDEXES:
+        connection.execute(statement)
+
+
+def _migrate_user_section_stats(connection):
+    connection.execute(USER_SECTION_STATS_SQL)
+    _rebuild_user_section_stats(connection)
+
+
+def _migrate_company_attempt_counts(connection):
+    existing_columns = {row["name"] for row in connection.execute("PRAGMA table_info(company_test_attempts)").fetchall()}
+    if "correct_answers" not in existing_columns:
+        connection.execute("ALTER TABLE company_test_attempts ADD COLUMN correct_answers INTEGER")
+    if "total_questions" not in existing_columns:
+        connection.execute("ALTER TABLE company_test_attempts ADD COLUMN total_questions INTEGER")
+    connection.execute(
+        """
+        UPDATE company_test_attempts
+        SET correct_answers = (
+                SELECT COUNT(*) FROM company_test_responses ctr
+                WHERE ctr.attempt_id = company_test_attempts.id AND ctr.is_correct = 1
+            ),
+            total_questions = (
+                SELECT COUNT(*) FROM company_test_questions ctq
+                WHERE ctq.company_test_id = company_test_attempts.company_test_id
+            )
+        WHERE correct_answers IS NULL OR total_questions IS NULL
+        """
+    )
+
+
+def _migrate_admin_summaries(connection):
+    for statement in ADMIN_SUMMARY_TABLES_SQL.split(";"):
+        if statement.strip():
+            connection.execute(statement)
+    _rebuild_admin_summaries(connection)
+
+
+def _migrate_seed_state(connection):
+    connection.execute(SEED_STATE_SQL)
+
+
+def _migrate_maintenance_jobs(connection):
+    connection.execute(MAINTENANCE_JOBS_SQL)
+    connection.execute("CREATE INDEX IF NOT EXISTS idx_maintenance_jobs_type ON maintenance_jobs (job_type, id)")
+
+
+def _migrate_packed_responses(connection):
+    for table_name, _owner_column, _response_table, _key_column in PACKED_RESPONSE_SOURCES.values():
+        existing_columns = {row["name"] for row in connection.execute(f"PRAGMA table_info({table_name})").fetchall()}
+        if "packed_responses" not in existing_columns:
+            connection.execute(f"ALTER TABLE {table_name} ADD COLUMN packed_responses BLOB")
+
+
+def _migrate_topic_bank(connection):
+    for statement in TOPIC_BANK_TABLES_SQL.split(";"):
+        if statement.strip():
+            connection.execute(statement)
+    connection.execute("INSERT OR IGNORE INTO topic_bank_state (id, version) VALUES (1, 0)")
+
+
+def _migrate_question_categories(connection):
+    for table_name in ("company_test_questions", "topic_bank_questions"):
+        existing_columns = {row["name"] for row in connection.execute(f"PRAGMA table_info({table_name})").fetchall()}
+        if "category" not in existing_columns:
+            connection.execute(f"ALTER TABLE {table_name} ADD COLUMN category TEXT")
+
+
+def _migrate_recommendation_stats(connection):
+    for statement in RECOMMENDATION_STATS_SQL.split(";"):
+        if statement.strip():
+            connection.execute(statement)
+
+
+def _migrate_ai_recommendation_latest(connection):
+    existing_columns = {row["name"] for row in connection.execute("PRAGMA table_info(ai_recommendations)").fetchall()}
+    if "payload_zlib" not in existing_columns:
+        connection.execute("ALTER TABLE ai_recommendations ADD COLUMN payload_zlib BLOB")
+    connection.execute(AI_RECOMMENDATION_LATEST_SQL)
+    connection.execute(
+        """
+        INSERT OR IGNORE INTO ai_recommendation_latest (user_id, id, weak_sections, improvement_areas, practice_focus, recommendation_payload, readiness_score, generated_at)
+        SELECT r.user_id, r.id, r.weak_sections, r.improvement_areas, r.practice_focus, r.recommendation_payload, r.readiness_score, r.generated_at
+        FROM ai_recommendations r
+        WHERE r.id = (SELECT id FROM ai_recommendations WHERE user_id = r.user_id ORDER BY generated_at DESC, id DESC LIMIT 1)
+        """
+    )
+
+
+SCHEMA_MIGRATIONS = [
+    (1, "legacy_columns", _migrate_legacy_columns),
+    (2, "hot_query_indexes", _migrate_hot_query_indexes),
+    (3, "user_section_stats", _migrate_user_section_stats),
+    (4, "company_attempt_counts", _migrate_company_attempt_counts),
+    (5, "admin_summaries", _migrate_admin_summaries),
+    (6, "seed_state", _migrate_seed_state),
+    (7, "maintenance_jobs", _migrate_maintenance_jobs),
+    (8, "packed_responses", _migrate_packed_responses),
+    (9, "topic_bank", _migrate_topic_bank),
+    (10, "question_categories", _migrate_question_categories),
+    (11, "recommendation_stats", _migrate_recommendation_stats),
+    (12, "ai_recommendation_latest", _migrate_ai_recommendation_latest),
+]
+
+
 def _seed_test_sections(connection):
     if connection.execute("SELECT COUNT(*) FROM test_sections").fetchone()[0]:
         return
@@ -341,10 +1222,12 @@ def _seed_questions(connection):
 
 
 def _seed_default_users(connection):
-    connection.executemany(
+    cursor = connection.executemany(
         "INSERT OR IGNORE INTO users (username, email, password, full_name, role, department, year, college) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
         DEFAULT_USERS,
     )
+    if cursor.rowcount:
+        _rebuild_department_summaries(connection)
 
 
 def _seed_company_tests(connection):
@@ -353,6 +1236,108 @@ def _seed_company_tests(connection):
         connection.execute("UPDATE companies SET description = ? WHERE company_name = ?", (seed["description"], seed["company_name"]))
 
 
+def _seed_topic_bank(connection):
+    sync_topic_bank(connection, get_topic_catalog())
+
+
+def sync_topic_bank(connection, catalog):
+    existing_topics = {row["topic_key"]: row for row in connection.execute("SELECT id, topic_key, content_hash FROM topic_bank_topics")}
+    existing_tests = {row["test_key"]: row for row in connection.execute("SELECT id, test_key, content_hash FROM topic_bank_tests")}
+    changed = 0
+    for topic_order, topic in enumerate(catalog):
+        topic_fields = {key: value for key, value in topic.items() if key != "tests"}
+        topic_hash = _content_hash(topic_fields, topic_order)
+        existing_topic = existing_topics.get(topic["topic_key"])
+        if existing_topic is None or existing_topic["content_hash"] != topic_hash:
+            connection.execute(
+                """
+                INSERT INTO topic_bank_topics (topic_key, topic_name, topic_source, description, test_count, sort_order, content_hash)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(topic_key) DO UPDATE SET
+                    topic_name = excluded.topic_name,
+                    topic_source = excluded.topic_source,
+                    description = excluded.description,
+                    test_count = excluded.test_count,
+                    sort_order = excluded.sort_order,
+                    content_hash = excluded.content_hash
+                """,
+                (topic["topic_key"], topic["topic_name"], topic.get("topic_source"), topic.get("description"), topic.get("test_count", len(topic["tests"])), topic_order, topic_hash),
+            )
+            changed += 1
+        topic_id = connection.execute("SELECT id FROM topic_bank_topics WHERE topic_key = ?", (topic["topic_key"],)).fetchone()["id"]
+
+        for test_order, test in enumerate(topic["tests"]):
+            test_hash = _content_hash(test, topic_id, test_order)
+            existing_test = existing_tests.get(test["test_id"])
+            if existing_test is not None and existing_test["content_hash"] == test_hash:
+                continue
+            connection.execute(
+                """
+                INSERT INTO topic_bank_tests (test_key, topic_id, test_name, description, time_limit, sort_order, content_hash)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(test_key) DO UPDATE SET
+                    topic_id = excluded.topic_id,
+                    test_name = excluded.test_name,
+                    description = excluded.description,
+                    time_limit = excluded.time_limit,
+                    sort_order = excluded.sort_order,
+                    content_hash = excluded.content_hash
+                """,
+                (test["test_id"], topic_id, test["test_name"], test.get("description"), test.get("time_limit"), test_order, test_hash),
+            )
+            test_id = connection.execute("SELECT id FROM topic_bank_tests WHERE test_key = ?", (test["test_id"],)).fetchone()["id"]
+            question_keys = [row["question_key"] for row in connection.execute("SELECT question_key FROM topic_bank_questions WHERE test_id = ? ORDER BY question_order", (test_id,))]
+            if question_keys != [question["question_key"] for question in test["questions"]]:
+                _unpack_attempt_responses(connection, "topic", test["test_id"], question_keys)
+            connection.execute("DELETE FROM topic_bank_questions WHERE test_id = ?", (test_id,))
+            connection.executemany(
+                """
+                INSERT INTO topic_bank_questions (
+                    test_id, question_order, question_id, question_key, question_text, option_a, option_b, option_c, option_d,
+                    correct_answer, explanation, difficulty, points, category
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                [
+                    (
+                        test_id,
+                        question_order,
+                        question["question_id"],
+                        question["question_key"],
+                        question["question_text"],
+                        question["options"].get("A"),
+                        question["options"].get("B"),
+                        question["options"].get("C"),
+                        question["options"].get("D"),
+                        question["correct_answer"],
+                        question.get("explanation"),
+                        question.get("difficulty", "Medium"),
+                        question.get("points", 1),
+                        question.get("category") or infer_topic_category(topic["topic_name"], question["question_text"]),
+                    )
+                    for question_order, question in enumerate(test["questions"], start=1)
+                ],
+            )
+            changed += 1
+
+    if changed:
+        _bump_topic_bank_version(connection)
+        _reset_recommendation_stats(connection)
+    return changed
+
+
+def _content_hash(*values):
+    return hashlib.sha256(json.dumps(values, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def _bump_topic_bank_version(connection):
+    connection.execute(
+        """
+        INSERT INTO topic_bank_state (id, version, updated_at) VALUES (1, 1, CURRENT_TIMESTAMP)
+        ON CONFLICT(id) DO UPDATE SET version = version + 1, updated_at = CURRENT_TIMESTAMP
+        """
+    )
+
+
 def _seed_company_test_questions(connection):
     for company_key, seed in COMPANY_TEST_SEED.items():
         company = connection.execute("SELECT id FROM companies WHERE lower(company_name) = ?", (company_key.lower(),)).fetchone()
@@ -386,6 +1371,16 @@ def _seed_company_test_questions(connection):
                     "INSERT INTO company_test_questions (company_test_id, section, question_type, question_text, option_a, option_b, option_c, option_d, correct_answer, coding_output, difficulty, points) VALUES (?, ?, 'mcq', ?, ?, ?, ?, ?, ?, ?, ?, 1)",
                     (company_test["id"], section, question_text, options["A"], options["B"], options["C"], options["D"], correct_answer, explanation, difficulty),
                 )
+    _classify_company_test_questions(connection)
+
+
+def _classify_company_test_questions(connection):
+    updates = []
+    for row in connection.execute("SELECT id, section, question_text, category FROM company_test_questions"):
+        category = infer_topic_category(row["section"], row["question_text"]) if row["section"] else None
+        if category != row["category"]:
+            updates.append((category, row["id"]))
+    connection.executemany("UPDATE company_test_questions SET category = ? WHERE id = ?", updates)
 
 
 def get_user_by_credentials(username, password):
@@ -393,39 +1388,236 @@ def get_user_by_credentials(username, password):
 
 
 def create_user(username, email, password, full_name, department, year, college):
-    return _execute(
-        "INSERT INTO users (username, email, password, full_name, department, year, college) VALUES (?, ?, ?, ?, ?, ?, ?)",
-        (username, email, password, full_name, department, year, college),
-    )
+    with _write_transaction() as connection:
+        user_id = connection.execute(
+            "INSERT INTO users (username, email, password, full_name, department, year, college) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (username, email, password, full_name, department, year, college),
+        ).lastrowid
+        if department is not None:
+            connection.execute(
+                "INSERT INTO department_summaries (department, student_count) VALUES (?, 1) ON CONFLICT (department) DO UPDATE SET student_count = student_count + 1",
+                (department,),
+            )
+    return user_id
 
 
 def get_topic_attempts_for_user(user_id):
     return _fetch_all("SELECT test_key, score, correct_answers, total_questions, completed_at FROM topic_test_attempts WHERE user_id = ?", (user_id,))
 
 
-def get_topic_attempt(user_id, test_key):
-    return _fetch_one("SELECT id, score, correct_answers, completed_at, time_taken FROM topic_test_attempts WHERE user_id = ? AND test_key = ?", (user_id, test_key))
+def get_topic_bank_version():
+    if has_request_context() and "topic_bank_version" in g:
+        return g.topic_bank_version
+    row = _fetch_one("SELECT version FROM topic_bank_state WHERE id = 1")
+    version = row["version"] if row else 0
+    if has_request_context():
+        g.topic_bank_version = version
+    return version
 
 
-def create_topic_attempt(user_id, test_key, topic_name, test_name, total_questions, time_taken, completed_at):
-    return _execute(
-        "INSERT INTO topic_test_attempts (user_id, test_key, topic_name, test_name, total_questions, time_taken, completed_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
-        (user_id, test_key, topic_name, test_name, total_questions, time_taken, completed_at),
-    )
+def get_topic_test(test_key):
+    return _cached_topic_bank_entry(("test", test_key), _load_topic_test, test_key)
 
 
-def create_topic_response(attempt_id, question_key, selected_answer, is_correct):
-    return _execute(
-        "INSERT INTO topic_test_responses (attempt_id, question_key, selected_answer, is_correct) VALUES (?, ?, ?, ?)",
-        (attempt_id, question_key, selected_answer, is_correct),
+def get_topic_bank_listing():
+    return _cached_topic_bank_entry(("listing",), _load_topic_bank_listing)
+
+
+def get_topic_bank_cache_stats():
+    with TOPIC_BANK_CACHE_LOCK:
+        return {"version": get_topic_bank_version(), "entries": len(TOPIC_BANK_CACHE), **TOPIC_BANK_CACHE_STATS}
+
+
+def _cached_topic_bank_entry(entry_key, loader, *args):
+    cache_key = (current_app.config["DATABASE_PATH"], get_topic_bank_version()) + entry_key
+    with TOPIC_BANK_CACHE_LOCK:
+        if cache_key in TOPIC_BANK_CACHE:
+            TOPIC_BANK_CACHE.move_to_end(cache_key)
+            TOPIC_BANK_CACHE_STATS["hits"] += 1
+            return TOPIC_BANK_CACHE[cache_key]
+        TOPIC_BANK_CACHE_STATS["misses"] += 1
+
+    entry = loader(*args)
+    max_entries = max(int(current_app.config.get("TOPIC_BANK_CACHE_SIZE", 256)), 1)
+    with TOPIC_BANK_CACHE_LOCK:
+        TOPIC_BANK_CACHE[cache_key] = entry
+        while len(TOPIC_BANK_CACHE) > max_entries:
+            TOPIC_BANK_CACHE.popitem(last=False)
+    return entry
+
+
+def _load_topic_test(test_key):
+    test = _fetch_one(
+        """
+        SELECT t.id, t.test_key, t.test_name, t.description, t.time_limit, tp.topic_name, tp.topic_key, tp.topic_source
+        FROM topic_bank_tests t
+        JOIN topic_bank_topics tp ON tp.id = t.topic_id
+        WHERE t.test_key = ?
+        """,
+        (test_key,),
     )
+    if test is None:
+        return None
+    questions = _fetch_all(
+        """
+        SELECT question_id, question_key, question_text, option_a, option_b, option_c, option_d, correct_answer, explanation, difficulty, points, category
+        FROM topic_bank_questions
+        WHERE test_id = ?
+        ORDER BY question_order
+        """,
+        (test["id"],),
+    )
+    return MappingProxyType({
+        "test_id": test["test_key"],
+        "topic_name": test["topic_name"],
+        "topic_key": test["topic_key"],
+        "topic_source": test["topic_source"],
+        "test_name": test["test_name"],
+        "description": test["description"],
+        "time_limit": test["time_limit"],
+        "questions": tuple(
+            MappingProxyType({
+                "question_id": question["question_id"],
+                "question_key": question["question_key"],
+                "question_text": question["question_text"],
+                "options": MappingProxyType({"A": question["option_a"], "B": question["option_b"], "C": question["option_c"], "D": question["option_d"]}),
+                "correct_answer": question["correct_answer"],
+                "explanation": question["explanation"],
+                "difficulty": question["difficulty"] or "Medium",
+                "points": question["points"],
+                "category": question["category"],
+            })
+            for question in questions
+        ),
+    })
+
+
+def _load_topic_bank_listing():
+    rows = _fetch_all(
+        """
+        SELECT tp.id AS topic_id, tp.topic_key, tp.topic_name, tp.description, tp.test_count,
+               t.test_key, t.test_name, t.description AS test_description, t.time_limit,
+               COUNT(q.id) AS question_count,
+               GROUP_CONCAT(DISTINCT COALESCE(q.difficulty, 'Medium')) AS difficulties
+        FROM topic_bank_topics tp
+        LEFT JOIN topic_bank_tests t ON t.topic_id = tp.id
+        LEFT JOIN topic_bank_questions q ON q.test_id = t.id
+        GROUP BY tp.id, t.id
+        ORDER BY tp.sort_order, tp.id, t.sort_order, t.id
+        """
+    )
+    listing = []
+    for row in rows:
+        if not listing or listing[-1][0] != row["topic_id"]:
+            topic = MappingProxyType({
+                "topic_name": row["topic_name"],
+                "topic_key": row["topic_key"],
+                "description": row["description"],
+                "test_count": row["test_count"],
+            })
+            listing.append((row["topic_id"], topic, []))
+        if row["test_key"] is not None:
+            listing[-1][2].append(MappingProxyType({
+                "test_id": row["test_key"],
+                "test_name": row["test_name"],
+                "description": row["test_description"],
+                "question_count": row["question_count"],
+                "time_limit": row["time_limit"],
+                "difficulty_tags": tuple(sorted(set((row["difficulties"] or "").split(",")) - {""})),
+            }))
+    return tuple((topic, tuple(tests)) for _topic_id, topic, tests in listing)
+
+
+def _topic_question_keys(test_key):
+    test = get_topic_test(test_key)
+    return [question["question_key"] for question in test["questions"]] if test else []
+
+
+def get_topic_attempt_marker(user_id):
+    row = _fetch_one("SELECT COUNT(*) AS attempt_count, MAX(id) AS latest_attempt_id FROM topic_test_attempts WHERE user_id = ?", (user_id,))
+    return row["attempt_count"], row["latest_attempt_id"]
+
+
+def has_topic_attempt(user_id, test_key):
+    return _fetch_one("SELECT 1 FROM topic_test_attempts WHERE user_id = ? AND test_key = ?", (user_id, test_key)) is not None
+
+
+def get_topic_attempt(user_id, test_key):
+    return _fetch_one("SELECT id, score, correct_answers, completed_at, time_taken FROM topic_test_attempts WHERE user_id = ? AND test_key = ?", (user_id, test_key))
 
 
-def finalize_topic_attempt(attempt_id, score, correct_answers):
-    _execute("UPDATE topic_test_attempts SET score = ?, correct_answers = ? WHERE id = ?", (score, correct_answers, attempt_id))
+def encode_packed_responses(answers):
+    count = len(answers)
+    codes = bytearray((count + 3) // 4)
+    answered = bytearray((count + 7) // 8)
+    correct = bytearray((count + 7) // 8)
+    for index, (selected_answer, is_correct) in enumerate(answers):
+        if selected_answer and _is_packable_answer(selected_answer):
+            code = PACKED_ANSWER_CODES.index(str(selected_answer).strip().upper())
+            codes[index // 4] |= code << (index % 4 * 2)
+            answered[index // 8] |= 1 << (index % 8)
+        if is_correct:
+            correct[index // 8] |= 1 << (index % 8)
+    return bytes(codes + answered + correct)
+
+
+def decode_packed_responses(blob, count):
+    codes_length = (count + 3) // 4
+    bitmap_length = (count + 7) // 8
+    codes = blob[:codes_length]
+    answered = blob[codes_length:codes_length + bitmap_length]
+    correct = blob[codes_length + bitmap_length:codes_length + 2 * bitmap_length]
+    decoded = []
+    for index in range(count):
+        selected_answer = ""
+        if answered[index // 8] >> (index % 8) & 1:
+            selected_answer = PACKED_ANSWER_CODES[codes[index // 4] >> (index % 4 * 2) & 3]
+        decoded.append((selected_answer, int(correct[index // 8] >> (index % 8) & 1)))
+    return decoded
+
+
+def _packed_responses_for(responses):
+    mode = current_app.config.get("RESPONSE_STORAGE_MODE", "rows")
+    if mode not in RESPONSE_STORAGE_MODES:
+        raise ValueError(f"Unsupported RESPONSE_STORAGE_MODE value: {mode}")
+    if mode != "packed":
+        return None
+    return encode_packed_responses([(selected_answer, is_correct) for _key, selected_answer, is_correct in responses])
+
+
+def _decode_attempt_responses(attempt, question_keys, key_column):
+    decoded = decode_packed_responses(attempt["packed_responses"], min(attempt["total_questions"] or 0, len(question_keys)))
+    return [
+        {key_column: question_key, "selected_answer": selected_answer, "is_correct": is_correct}
+        for question_key, (selected_answer, is_correct) in zip(question_keys, decoded)
+    ]
+
+
+def record_topic_attempt(user_id, test_key, topic_name, test_name, time_taken, completed_at, responses, score, correct_answers):
+    return _submit_write(_insert_topic_attempt, user_id, test_key, topic_name, test_name, time_taken, completed_at, responses, score, correct_answers, _packed_responses_for(responses))
+
+
+def _insert_topic_attempt(connection, user_id, test_key, topic_name, test_name, time_taken, completed_at, responses, score, correct_answers, packed_responses):
+    attempt_id = connection.execute(
+        "INSERT INTO topic_test_attempts (user_id, test_key, topic_name, test_name, score, total_questions, correct_answers, time_taken, completed_at, packed_responses) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        (user_id, test_key, topic_name, test_name, score, len(responses), correct_answers, time_taken, completed_at, packed_responses),
+    ).lastrowid
+    if packed_responses is None:
+        connection.executemany(
+            "INSERT INTO topic_test_responses (attempt_id, question_key, selected_answer, is_correct) VALUES (?, ?, ?, ?)",
+            [(attempt_id, question_key, selected_answer, is_correct) for question_key, selected_answer, is_correct in responses],
+        )
+    _record_section_score(connection, user_id, topic_name, score, completed_at)
+    _record_student_attempt(connection, user_id, "topic", score, completed_at)
+    if _has_recommendation_stats(connection, user_id):
+        _merge_recommendation_stats(connection, user_id, summarize_recommendation_rows(_topic_recommendation_rows(connection, attempt_id, test_key, topic_name, test_name, completed_at, score, responses)))
+    return attempt_id
 
 
 def get_topic_responses(attempt_id):
+    attempt = _fetch_one("SELECT test_key, total_questions, packed_responses FROM topic_test_attempts WHERE id = ?", (attempt_id,))
+    if attempt and attempt["packed_responses"] is not None:
+        return _decode_attempt_responses(attempt, _topic_question_keys(attempt["test_key"]), "question_key")
     return _fetch_all("SELECT question_key, selected_answer, is_correct FROM topic_test_responses WHERE attempt_id = ?", (attempt_id,))
 
 
@@ -439,64 +1631,103 @@ def get_questions_for_section(section_id, include_answers=False):
     return _fetch_all("SELECT id, question_text, option_a, option_b, option_c, option_d FROM questions WHERE section_id = ? ORDER BY id", (section_id,))
 
 
-def create_test_attempt(user_id, section_id, total_questions, time_taken, completed_at):
-    return _execute(
-        "INSERT INTO test_attempts (user_id, section_id, total_questions, time_taken, completed_at) VALUES (?, ?, ?, ?, ?)",
-        (user_id, section_id, total_questions, time_taken, completed_at),
-    )
+def record_test_attempt(user_id, section_id, time_taken, completed_at, responses, score, correct_answers):
+    return _submit_write(_insert_test_attempt, user_id, section_id, time_taken, completed_at, responses, score, correct_answers, _packed_responses_for(responses))
 
 
-def create_user_response(attempt_id, question_id, selected_answer, is_correct):
-    return _execute(
-        "INSERT INTO user_responses (attempt_id, question_id, selected_answer, is_correct) VALUES (?, ?, ?, ?)",
-        (attempt_id, question_id, selected_answer, is_correct),
-    )
+def _insert_test_attempt(connection, user_id, section_id, time_taken, completed_at, responses, score, correct_answers, packed_responses):
+    attempt_id = connection.execute(
+        "INSERT INTO test_attempts (user_id, section_id, score, total_questions, correct_answers, time_taken, completed_at, packed_responses) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        (user_id, section_id, score, len(responses), correct_answers, time_taken, completed_at, packed_responses),
+    ).lastrowid
+    if packed_responses is None:
+        connection.executemany(
+            "INSERT INTO user_responses (attempt_id, question_id, selected_answer, is_correct) VALUES (?, ?, ?, ?)",
+            [(attempt_id, question_id, selected_answer, is_correct) for question_id, selected_answer, is_correct in responses],
+        )
+    section = connection.execute("SELECT section_name FROM test_sections WHERE id = ?", (section_id,)).fetchone()
+    if section:
+        _record_section_score(connection, user_id, section["section_name"], score, completed_at)
+        _record_student_attempt(connection, user_id, "test", score, completed_at)
+    return attempt_id
+
+
+def get_company_tests_for_user(user_id, after=None, limit=None):
+    return list(iter_company_tests_for_user(user_id, after, limit))
+
+
+def iter_company_tests_for_user(user_id, after=None, limit=None):
+    catalog = [entry for entry in get_company_test_catalog() if after is None or (entry["company_name"], entry["test_name"]) > tuple(after)]
+    if limit is not None:
+        catalog = catalog[:limit]
+    if not catalog:
+        return iter(())
+
+    attempts = {
+        row["company_test_id"]: row
+        for row in _fetch_all(
+            """
+            SELECT company_test_id, id, score, completed_at, attempt_count
+            FROM (
+                SELECT company_test_id, id, score, completed_at,
+                       ROW_NUMBER() OVER (PARTITION BY company_test_id ORDER BY completed_at DESC, id DESC) AS recency,
+                       COUNT(*) OVER (PARTITION BY company_test_id) AS attempt_count
+                FROM company_test_attempts
+                WHERE user_id = ?
+            ) ranked_attempts
+            WHERE recency = 1
+            """,
+            (user_id,),
+        )
+    }
+    return (_merge_company_test_attempt(entry, attempts.get(entry["id"])) for entry in catalog)
 
 
-def finalize_test_attempt(attempt_id, score, correct_answers):
-    _execute("UPDATE test_attempts SET score = ?, correct_answers = ? WHERE id = ?", (score, correct_answers, attempt_id))
+def _merge_company_test_attempt(entry, attempt):
+    return {
+        **entry,
+        "latest_attempt_id": attempt["id"] if attempt else None,
+        "score": attempt["score"] if attempt else None,
+        "completed_at": attempt["completed_at"] if attempt else None,
+        "attempt_count": attempt["attempt_count"] if attempt else 0,
+        "attempted": 1 if attempt else 0,
+    }
 
 
-def get_company_tests_for_user(user_id):
-    seeded_test_names = {
-        test_seed["test_name"]
-        for company_seed in COMPANY_TEST_SEED.values()
-        for test_seed in company_seed["tests"]
-    }
-    rows = _fetch_all(
-        """
-        SELECT ct.id, c.company_name, c.description, ct.test_name, ct.total_duration,
-               COALESCE(question_counts.question_count, ct.total_questions) AS total_questions,
-               latest_attempt.id AS latest_attempt_id,
-               latest_attempt.score,
-               latest_attempt.completed_at,
-               COALESCE(attempt_counts.attempt_count, 0) AS attempt_count,
-               CASE WHEN latest_attempt.id IS NULL THEN 0 ELSE 1 END AS attempted
-        FROM company_tests ct
-        JOIN companies c ON ct.company_id = c.id
-        LEFT JOIN (
-            SELECT company_test_id, COUNT(*) AS question_count
-            FROM company_test_questions
-            GROUP BY company_test_id
-        ) question_counts ON question_counts.company_test_id = ct.id
-        LEFT JOIN (
-            SELECT company_test_id, COUNT(*) AS attempt_count
-            FROM company_test_attempts
-            WHERE user_id = ?
-            GROUP BY company_test_id
-        ) attempt_counts ON attempt_counts.company_test_id = ct.id
-        LEFT JOIN company_test_attempts latest_attempt ON latest_attempt.id = (
-            SELECT cta2.id
-            FROM company_test_attempts cta2
-            WHERE cta2.user_id = ? AND cta2.company_test_id = ct.id
-            ORDER BY cta2.completed_at DESC, cta2.id DESC
-            LIMIT 1
-        )
-        ORDER BY c.company_name, ct.test_name
-        """,
-        (user_id, user_id),
-    )
-    return [row for row in rows if row["test_name"] in seeded_test_names]
+def get_company_test_catalog():
+    cache_key = (current_app.config["DATABASE_PATH"], bootstrap_fingerprint())
+    catalog = COMPANY_CATALOG_CACHE.get(cache_key)
+    if catalog is not None:
+        return catalog
+
+    with COMPANY_CATALOG_LOCK:
+        catalog = COMPANY_CATALOG_CACHE.get(cache_key)
+        if catalog is None:
+            seeded_test_names = sorted({
+                test_seed["test_name"]
+                for company_seed in COMPANY_TEST_SEED.values()
+                for test_seed in company_seed["tests"]
+            })
+            rows = _fetch_all(
+                f"""
+                SELECT ct.id, c.company_name, c.description, ct.test_name, ct.total_duration,
+                       COALESCE(question_counts.question_count, ct.total_questions) AS total_questions
+                FROM company_tests ct
+                JOIN companies c ON ct.company_id = c.id
+                LEFT JOIN (
+                    SELECT company_test_id, COUNT(*) AS question_count
+                    FROM company_test_questions
+                    GROUP BY company_test_id
+                ) question_counts ON question_counts.company_test_id = ct.id
+                WHERE ct.test_name IN ({", ".join("?" for _ in seeded_test_names)})
+                ORDER BY c.company_name, ct.test_name
+                """,
+                seeded_test_names,
+            )
+            catalog = tuple(dict(row) for row in rows)
+            COMPANY_CATALOG_CACHE.clear()
+            COMPANY_CATALOG_CACHE[cache_key] = catalog
+    return catalog
 
 
 def get_company_test_attempt(user_id, company_test_id):
@@ -523,7 +1754,7 @@ def get_company_test(company_test_id):
 def get_company_test_questions(company_test_id, include_answers=False):
     if include_answers:
         return _fetch_all(
-            "SELECT id, section, question_text, option_a, option_b, option_c, option_d, correct_answer, coding_output, difficulty, points FROM company_test_questions WHERE company_test_id = ? ORDER BY id",
+            "SELECT id, section, question_text, option_a, option_b, option_c, option_d, correct_answer, coding_output, difficulty, points, category FROM company_test_questions WHERE company_test_id = ? ORDER BY id",
             (company_test_id,),
         )
     return _fetch_all(
@@ -532,119 +1763,253 @@ def get_company_test_questions(company_test_id, include_answers=False):
     )
 
 
-def create_company_test_attempt(user_id, company_test_id, time_taken, completed_at):
-    return _execute(
-        "INSERT INTO company_test_attempts (user_id, company_test_id, time_taken, completed_at) VALUES (?, ?, ?, ?)",
-        (user_id, company_test_id, time_taken, completed_at),
-    )
-
-
-def create_company_test_response(attempt_id, question_id, selected_answer, is_correct):
-    return _execute(
-        "INSERT INTO company_test_responses (attempt_id, question_id, selected_answer, is_correct) VALUES (?, ?, ?, ?)",
-        (attempt_id, question_id, selected_answer, is_correct),
-    )
+def record_company_test_attempt(user_id, company_test_id, time_taken, completed_at, responses, score, correct_answers):
+    return _submit_write(_insert_company_test_attempt, user_id, company_test_id, time_taken, completed_at, responses, score, correct_answers, _packed_responses_for(responses))
 
 
-def finalize_company_test_attempt(attempt_id, score):
-    _execute("UPDATE company_test_attempts SET score = ? WHERE id = ?", (score, attempt_id))
+def _insert_company_test_attempt(connection, user_id, company_test_id, time_taken, completed_at, responses, score, correct_answers, packed_responses):
+    attempt_id = connection.execute(
+        "INSERT INTO company_test_attempts (user_id, company_test_id, score, correct_answers, total_questions, time_taken, completed_at, packed_responses) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        (user_id, company_test_id, score, correct_answers, len(responses), time_taken, completed_at, packed_responses),
+    ).lastrowid
+    if packed_responses is None:
+        connection.executemany(
+            "INSERT INTO company_test_responses (attempt_id, question_id, selected_answer, is_correct) VALUES (?, ?, ?, ?)",
+            [(attempt_id, question_id, selected_answer, is_correct) for question_id, selected_answer, is_correct in responses],
+        )
+    company = connection.execute(
+        "SELECT c.company_name, ct.test_name FROM company_tests ct JOIN companies c ON ct.company_id = c.id WHERE ct.id = ?",
+        (company_test_id,),
+    ).fetchone()
+    if company:
+        _record_section_score(connection, user_id, f"{company['company_name']} Company Tests", score, completed_at)
+        _record_student_attempt(connection, user_id, "company", score, completed_at)
+        if _has_recommendation_stats(connection, user_id):
+            _merge_recommendation_stats(connection, user_id, summarize_recommendation_rows(_company_recommendation_rows(connection, attempt_id, company_test_id, company, completed_at, score, responses)))
+    return attempt_id
 
 
 def get_company_test_responses(attempt_id):
+    attempt = _fetch_one("SELECT company_test_id, total_questions, packed_responses FROM company_test_attempts WHERE id = ?", (attempt_id,))
+    if attempt and attempt["packed_responses"] is not None:
+        question_ids = [row["id"] for row in _fetch_all("SELECT id FROM company_test_questions WHERE company_test_id = ? ORDER BY id", (attempt["company_test_id"],))]
+        return _decode_attempt_responses(attempt, question_ids, "question_id")
     return _fetch_all("SELECT question_id, selected_answer, is_correct FROM company_test_responses WHERE attempt_id = ?", (attempt_id,))
 
 
-def get_user_scores(user_id):
-    return _fetch_all(
-        """
-        SELECT ta.score, ta.correct_answers, ta.total_questions, ta.completed_at, ts.section_name
-        FROM test_attempts ta
-        JOIN test_sections ts ON ta.section_id = ts.id
-        WHERE ta.user_id = ?
-        UNION ALL
-        SELECT tta.score, tta.correct_answers, tta.total_questions, tta.completed_at,
-               tta.topic_name || ' - ' || tta.test_name AS section_name
-        FROM topic_test_attempts tta
-        WHERE tta.user_id = ?
-        UNION ALL
-        SELECT cta.score,
-               COALESCE(correct_counts.correct_answers, 0) AS correct_answers,
-               COALESCE(question_counts.total_questions, 0) AS total_questions,
-               cta.completed_at,
-               c.company_name || ' - ' || ct.test_name AS section_name
-        FROM company_test_attempts cta
-        JOIN company_tests ct ON cta.company_test_id = ct.id
-        JOIN companies c ON ct.company_id = c.id
-        LEFT JOIN (
-            SELECT ctr.attempt_id, COUNT(*) AS correct_answers
-            FROM company_test_responses ctr
-            WHERE ctr.is_correct = 1
-            GROUP BY ctr.attempt_id
-        ) correct_counts ON correct_counts.attempt_id = cta.id
-        LEFT JOIN (
-            SELECT company_test_id, COUNT(*) AS total_questions
-            FROM company_test_questions
-            GROUP BY company_test_id
-        ) question_counts ON question_counts.company_test_id = ct.id
-        WHERE cta.user_id = ?
-        ORDER BY completed_at DESC
-        """,
-        (user_id, user_id, user_id),
-    )
+def get_user_scores(user_id, after=None, limit=None):
+    return _fetch_all(*_user_scores_query(user_id, after, limit))
 
 
-def get_section_performance(user_id):
-    return _fetch_all(
-        """
-        SELECT section_name, AVG(score) AS avg_score, COUNT(*) AS attempts
+def iter_user_scores(user_id, after=None, limit=None):
+    return _iter_rows(*_user_scores_query(user_id, after, limit))
+
+
+def _user_scores_query(user_id, after, limit):
+    keyset_filter = "WHERE (completed_at, attempt_kind, attempt_id) < (?, ?, ?)" if after else ""
+    query = f"""
+        SELECT score, correct_answers, total_questions, completed_at, section_name, attempt_kind, attempt_id
         FROM (
-            SELECT ts.section_name AS section_name, ta.score AS score
+            SELECT ta.score, ta.correct_answers, ta.total_questions, ta.completed_at, ts.section_name,
+                   'test' AS attempt_kind, ta.id AS attempt_id
             FROM test_attempts ta
             JOIN test_sections ts ON ta.section_id = ts.id
             WHERE ta.user_id = ?
             UNION ALL
-            SELECT tta.topic_name AS section_name, tta.score AS score
+            SELECT tta.score, tta.correct_answers, tta.total_questions, tta.completed_at,
+                   tta.topic_name || ' - ' || tta.test_name AS section_name,
+                   'topic' AS attempt_kind, tta.id AS attempt_id
             FROM topic_test_attempts tta
             WHERE tta.user_id = ?
             UNION ALL
-            SELECT c.company_name || ' Company Tests' AS section_name, cta.score AS score
+            SELECT cta.score,
+                   COALESCE(cta.correct_answers, 0) AS correct_answers,
+                   COALESCE(cta.total_questions, 0) AS total_questions,
+                   cta.completed_at,
+                   c.company_name || ' - ' || ct.test_name AS section_name,
+                   'company' AS attempt_kind, cta.id AS attempt_id
             FROM company_test_attempts cta
             JOIN company_tests ct ON cta.company_test_id = ct.id
             JOIN companies c ON ct.company_id = c.id
             WHERE cta.user_id = ?
-        ) combined_scores
-        GROUP BY section_name
+        ) score_history
+        {keyset_filter}
+        ORDER BY completed_at DESC, attempt_kind DESC, attempt_id DESC
+        LIMIT ?
+        """
+    params = (user_id, user_id, user_id, *(after or ()), -1 if limit is None else limit)
+    return query, params
+
+
+def get_section_performance(user_id):
+    return _fetch_all(
+        """
+        SELECT section_name, score_sum / attempt_count AS avg_score, attempt_count AS attempts, best_score, last_score
+        FROM user_section_stats
+        WHERE user_id = ? AND attempt_count > 0
+        ORDER BY section_name
         """,
-        (user_id, user_id, user_id),
+        (user_id,),
     )
 
 
-def get_recommendation_performance(user_id):
-    return _fetch_all(
+def rebuild_user_section_stats(user_id=None):
+    with _write_transaction() as connection:
+        _rebuild_user_section_stats(connection, user_id)
+
+
+def rebuild_summary_tables():
+    with _write_transaction() as connection:
+        _rebuild_user_section_stats(connection)
+        _rebuild_admin_summaries(connection)
+        _reset_recommendation_stats(connection)
+
+
+def _record_section_score(connection, user_id, section_name, score, completed_at):
+    connection.execute(
         """
-        SELECT source_type, topic_name, test_name, section_name, category_name, difficulty, is_correct, score, completed_at
+        INSERT INTO user_section_stats (user_id, section_name, score_sum, attempt_count, best_score, last_score, last_completed_at)
+        VALUES (?, ?, ?, 1, ?, ?, ?)
+        ON CONFLICT (user_id, section_name) DO UPDATE SET
+            score_sum = score_sum + excluded.score_sum,
+            attempt_count = attempt_count + 1,
+            best_score = MAX(COALESCE(best_score, excluded.best_score), excluded.best_score),
+            last_score = CASE WHEN last_completed_at IS NULL OR excluded.last_completed_at >= last_completed_at THEN excluded.last_score ELSE last_score END,
+            last_completed_at = MAX(COALESCE(last_completed_at, excluded.last_completed_at), excluded.last_completed_at)
+        """,
+        (user_id, section_name, score, score, score, completed_at),
+    )
+
+
+def _record_student_attempt(connection, user_id, attempt_kind, score, completed_at):
+    kind_counts = tuple(int(attempt_kind == kind) for kind in ("test", "topic", "company"))
+    connection.execute(
+        """
+        INSERT INTO student_summaries (user_id, total_attempts, score_sum, test_attempts, topic_attempts, company_attempts, sections_attempted, last_attempt_at)
+        VALUES (?, 1, ?, ?, ?, ?, (SELECT COUNT(*) FROM user_section_stats WHERE user_id = ?), ?)
+        ON CONFLICT (user_id) DO UPDATE SET
+            total_attempts = total_attempts + 1,
+            score_sum = score_sum + excluded.score_sum,
+            test_attempts = test_attempts + excluded.test_attempts,
+            topic_attempts = topic_attempts + excluded.topic_attempts,
+            company_attempts = company_attempts + excluded.company_attempts,
+            sections_attempted = excluded.sections_attempted,
+            last_attempt_at = MAX(COALESCE(last_attempt_at, excluded.last_attempt_at), excluded.last_attempt_at)
+        """,
+        (user_id, score or 0) + kind_counts + (user_id, completed_at),
+    )
+    connection.execute(
+        "UPDATE department_summaries SET total_attempts = total_attempts + 1, score_sum = score_sum + ? WHERE department = (SELECT department FROM users WHERE id = ? AND role = 'student')",
+        (score or 0, user_id),
+    )
+
+
+def _rebuild_admin_summaries(connection, user_ids=None):
+    user_filter = "" if user_ids is None else f"WHERE user_id IN ({', '.join('?' for _ in user_ids)})"
+    params = () if user_ids is None else tuple(user_ids)
+    connection.execute(f"DELETE FROM student_summaries {user_filter}", params)
+    connection.execute(
+        f"""
+        INSERT INTO student_summaries (user_id, total_attempts, score_sum, test_attempts, topic_attempts, company_attempts, sections_attempted, last_attempt_at)
+        SELECT score_history.user_id, COUNT(*), SUM(COALESCE(score, 0)),
+               SUM(attempt_kind = 'test'), SUM(attempt_kind = 'topic'), SUM(attempt_kind = 'company'),
+               (SELECT COUNT(*) FROM user_section_stats uss WHERE uss.user_id = score_history.user_id),
+               MAX(completed_at)
+        FROM ({SECTION_SCORE_HISTORY_SQL}) score_history
+        {user_filter}
+        GROUP BY score_history.user_id
+        """,
+        params,
+    )
+    if user_ids is None:
+        _rebuild_department_summaries(connection)
+    else:
+        departments = [
+            row["department"]
+            for row in connection.execute(f"SELECT DISTINCT department FROM users WHERE department IS NOT NULL AND id IN ({', '.join('?' for _ in user_ids)})", params)
+        ]
+        if departments:
+            _rebuild_department_summaries(connection, departments)
+
+
+def _rebuild_department_summaries(connection, departments=None):
+    placeholders = "" if departments is None else ", ".join("?" for _ in departments)
+    department_filter = "" if departments is None else f"AND u.department IN ({placeholders})"
+    params = () if departments is None else tuple(departments)
+    connection.execute("DELETE FROM department_summaries" + ("" if departments is None else f" WHERE department IN ({placeholders})"), params)
+    connection.execute(
+        f"""
+        INSERT INTO department_summaries (department, student_count, total_attempts, score_sum)
+        SELECT u.department, COUNT(*), SUM(COALESCE(ss.total_attempts, 0)), SUM(COALESCE(ss.score_sum, 0))
+        FROM users u
+        LEFT JOIN student_summaries ss ON ss.user_id = u.id
+        WHERE u.role = 'student' AND u.department IS NOT NULL {department_filter}
+        GROUP BY u.department
+        """,
+        params,
+    )
+
+
+def _rebuild_user_section_stats(connection, user_id=None):
+    user_filter = "" if user_id is None else "WHERE user_id = ?"
+    params = () if user_id is None else (user_id,)
+    connection.execute(f"DELETE FROM user_section_stats {user_filter}", params)
+    connection.execute(
+        f"""
+        INSERT INTO user_section_stats (user_id, section_name, score_sum, attempt_count, best_score, last_score, last_completed_at)
+        SELECT user_id, section_name, SUM(score), COUNT(*), MAX(score), MAX(CASE WHEN recency = 1 THEN score END), MAX(completed_at)
+        FROM (
+            SELECT user_id, section_name, score, completed_at,
+                   ROW_NUMBER() OVER (PARTITION BY user_id, section_name ORDER BY completed_at DESC, attempt_id DESC) AS recency
+            FROM ({SECTION_SCORE_HISTORY_SQL}) score_history
+            {user_filter}
+        ) ranked_history
+        GROUP BY user_id, section_name
+        """,
+        params,
+    )
+
+
+def get_recommendation_performance(user_id, connection=None):
+    return _recommendation_performance_rows(user_id, user_id, connection)
+
+
+def _recommendation_performance_rows(first_user_id, last_user_id, connection=None):
+    rows = _fetch_all(
+        """
+        SELECT user_id, source_type, attempt_id, topic_name, test_name, section_name, category_name, question_text, difficulty, category, is_correct, score, completed_at
         FROM (
             SELECT
+                tta.user_id AS user_id,
                 'topic' AS source_type,
+                tta.id AS attempt_id,
                 tta.topic_name AS topic_name,
                 tta.test_name AS test_name,
                 tta.topic_name AS section_name,
                 ttr.question_key AS category_name,
-                NULL AS difficulty,
+                tbq.question_text AS question_text,
+                tbq.difficulty AS difficulty,
+                tbq.category AS category,
                 CAST(ttr.is_correct AS INTEGER) AS is_correct,
                 tta.score AS score,
                 tta.completed_at AS completed_at
             FROM topic_test_attempts tta
             JOIN topic_test_responses ttr ON ttr.attempt_id = tta.id
-            WHERE tta.user_id = ?
+            LEFT JOIN topic_bank_tests tbt ON tbt.test_key = tta.test_key
+            LEFT JOIN topic_bank_questions tbq ON tbq.test_id = tbt.id AND tbq.question_key = ttr.question_key
+            WHERE tta.user_id BETWEEN ? AND ?
             UNION ALL
             SELECT
+                cta.user_id AS user_id,
                 'company' AS source_type,
+                cta.id AS attempt_id,
                 c.company_name AS topic_name,
                 ct.test_name AS test_name,
                 c.company_name AS section_name,
                 ctq.section AS category_name,
+                NULL AS question_text,
                 COALESCE(ctq.difficulty, 'Medium') AS difficulty,
+                NULL AS category,
                 CAST(ctr.is_correct AS INTEGER) AS is_correct,
                 cta.score AS score,
                 cta.completed_at AS completed_at
@@ -653,48 +2018,513 @@ def get_recommendation_performance(user_id):
             JOIN companies c ON ct.company_id = c.id
             JOIN company_test_responses ctr ON ctr.attempt_id = cta.id
             JOIN company_test_questions ctq ON ctq.id = ctr.question_id
-            WHERE cta.user_id = ?
+            WHERE cta.user_id BETWEEN ? AND ?
         ) detailed_rows
-        ORDER BY completed_at DESC
+        ORDER BY user_id, completed_at DESC
         """,
-        (user_id, user_id),
+        (first_user_id, last_user_id, first_user_id, last_user_id),
+        connection=connection,
+    )
+    packed_rows = _packed_recommendation_rows(first_user_id, last_user_id, connection)
+    if not packed_rows:
+        return rows
+    rows = sorted([dict(row) for row in rows] + packed_rows, key=lambda row: row["completed_at"] or "", reverse=True)
+    return sorted(rows, key=lambda row: row["user_id"])
+
+
+def _packed_recommendation_rows(first_user_id, last_user_id, connection=None):
+    rows = []
+    for attempt in _fetch_all(
+        "SELECT id, user_id, topic_name, test_name, test_key, score, completed_at, total_questions, packed_responses FROM topic_test_attempts WHERE user_id BETWEEN ? AND ? AND packed_responses IS NOT NULL",
+        (first_user_id, last_user_id),
+        connection=connection,
+    ):
+        test = get_topic_test(attempt["test_key"])
+        questions = {question["question_key"]: question for question in test["questions"]} if test else {}
+        for response in _decode_attempt_responses(attempt, list(questions), "question_key"):
+            question = questions[response["question_key"]]
+            rows.append({
+                "user_id": attempt["user_id"],
+                "source_type": "topic",
+                "attempt_id": attempt["id"],
+                "topic_name": attempt["topic_name"],
+                "test_name": attempt["test_name"],
+                "section_name": attempt["topic_name"],
+                "category_name": response["question_key"],
+                "question_text": question["question_text"],
+                "difficulty": question["difficulty"],
+                "category": question["category"],
+                "is_correct": response["is_correct"],
+                "score": attempt["score"],
+                "completed_at": attempt["completed_at"],
+            })
+
+    company_questions = {}
+    for attempt in _fetch_all(
+        """
+        SELECT cta.id, cta.user_id, c.company_name, ct.test_name, cta.company_test_id, cta.score, cta.completed_at, cta.total_questions, cta.packed_responses
+        FROM company_test_attempts cta
+        JOIN company_tests ct ON cta.company_test_id = ct.id
+        JOIN companies c ON ct.company_id = c.id
+        WHERE cta.user_id BETWEEN ? AND ? AND cta.packed_responses IS NOT NULL
+        """,
+        (first_user_id, last_user_id),
+        connection=connection,
+    ):
+        if attempt["company_test_id"] not in company_questions:
+            company_questions[attempt["company_test_id"]] = {
+                row["id"]: row
+                for row in _fetch_all(
+                    "SELECT id, section, COALESCE(difficulty, 'Medium') AS difficulty FROM company_test_questions WHERE company_test_id = ? ORDER BY id",
+                    (attempt["company_test_id"],),
+                    connection=connection,
+                )
+            }
+        questions = company_questions[attempt["company_test_id"]]
+        for response in _decode_attempt_responses(attempt, list(questions), "question_id"):
+            question = questions[response["question_id"]]
+            rows.append({
+                "user_id": attempt["user_id"],
+                "source_type": "company",
+                "attempt_id": attempt["id"],
+                "topic_name": attempt["company_name"],
+                "test_name": attempt["test_name"],
+                "section_name": attempt["company_name"],
+                "category_name": question["section"],
+                "question_text": None,
+                "difficulty": question["difficulty"],
+                "category": None,
+                "is_correct": response["is_correct"],
+                "score": attempt["score"],
+                "completed_at": attempt["completed_at"],
+            })
+    return rows
+
+
+def get_recommendation_stats(user_id):
+    totals = _fetch_one("SELECT attempt_count, score_sum FROM user_recommendation_totals WHERE user_id = ?", (user_id,))
+    if totals is None:
+        with _write_transaction() as connection:
+            return _rebuild_recommendation_stats(connection, user_id)
+    stats = _empty_recommendation_stats()
+    stats["attempt_count"] = totals["attempt_count"]
+    stats["score_sum"] = totals["score_sum"]
+    for row in _fetch_all("SELECT dimension, name, correct, total, last_missed_at FROM user_recommendation_stats WHERE user_id = ?", (user_id,)):
+        if row["dimension"] in stats:
+            stats[row["dimension"]][row["name"]] = {"correct": row["correct"], "total": row["total"], "last_missed_at": row["last_missed_at"]}
+    return stats
+
+
+def summarize_recommendation_rows(performance_rows):
+    stats = _empty_recommendation_stats()
+    attempt_scores = {}
+    for row in performance_rows:
+        topic_name = row["section_name"] or row["topic_name"] or "General"
+        attempt_scores[(row["source_type"], row["attempt_id"])] = row["score"] or 0
+
+        raw_category = row["category_name"] or ""
+        if row["source_type"] == "company" and raw_category in TOPIC_CATEGORY_PATTERNS:
+            category_name = raw_category
+        else:
+            category_name = row["category"] or infer_topic_category(topic_name, row["question_text"] or raw_category)
+
+        for dimension, name in (("topic", topic_name), ("difficulty", row["difficulty"] or "Medium"), ("category", category_name)):
+            bucket = stats[dimension].setdefault(name, {"correct": 0, "total": 0, "last_missed_at": None})
+            bucket["total"] += 1
+            if row["is_correct"]:
+                bucket["correct"] += 1
+            elif row["completed_at"] and (bucket["last_missed_at"] is None or row["completed_at"] > bucket["last_missed_at"]):
+                bucket["last_missed_at"] = row["completed_at"]
+    stats["attempt_count"] = len(attempt_scores)
+    stats["score_sum"] = sum(attempt_scores.values())
+    return stats
+
+
+def _empty_recommendation_stats():
+    stats = {"attempt_count": 0, "score_sum": 0}
+    stats.update({dimension: {} for dimension in RECOMMENDATION_STAT_DIMENSIONS})
+    return stats
+
+
+def _has_recommendation_stats(connection, user_id):
+    return connection.execute("SELECT 1 FROM user_recommendation_totals WHERE user_id = ?", (user_id,)).fetchone() is not None
+
+
+def _rebuild_recommendation_stats(connection, user_id):
+    stats = summarize_recommendation_rows(get_recommendation_performance(user_id, connection))
+    _reset_recommendation_stats(connection, [user_id])
+    _merge_recommendation_stats(connection, user_id, stats)
+    return stats
+
+
+def _merge_recommendation_stats(connection, user_id, stats):
+    connection.execute(
+        """
+        INSERT INTO user_recommendation_totals (user_id, attempt_count, score_sum, updated_at)
+        VALUES (?, ?, ?, CURRENT_TIMESTAMP)
+        ON CONFLICT (user_id) DO UPDATE SET
+            attempt_count = attempt_count + excluded.attempt_count,
+            score_sum = score_sum + excluded.score_sum,
+            updated_at = excluded.updated_at
+        """,
+        (user_id, stats["attempt_count"], stats["score_sum"]),
+    )
+    connection.executemany(
+        """
+        INSERT INTO user_recommendation_stats (user_id, dimension, name, correct, total, last_missed_at)
+        VALUES (?, ?, ?, ?, ?, ?)
+        ON CONFLICT (user_id, dimension, name) DO UPDATE SET
+            correct = correct + excluded.correct,
+            total = total + excluded.total,
+            last_missed_at = CASE WHEN last_missed_at IS NULL OR excluded.last_missed_at > last_missed_at THEN excluded.last_missed_at ELSE last_missed_at END
+        """,
+        [
+            (user_id, dimension, name, bucket["correct"], bucket["total"], bucket["last_missed_at"])
+            for dimension in RECOMMENDATION_STAT_DIMENSIONS
+            for name, bucket in stats[dimension].items()
+        ],
     )
 
 
+def _reset_recommendation_stats(connection, user_ids=None):
+    if user_ids is None:
+        connection.execute("DELETE FROM user_recommendation_stats")
+        connection.execute("DELETE FROM user_recommendation_totals")
+        return
+    user_params = [(user_id,) for user_id in user_ids]
+    connection.executemany("DELETE FROM user_recommendation_stats WHERE user_id = ?", user_params)
+    connection.executemany("DELETE FROM user_recommendation_totals WHERE user_id = ?", user_params)
+
+
+def _topic_recommendation_rows(connection, attempt_id, test_key, topic_name, test_name, completed_at, score, responses):
+    questions = {
+        row["question_key"]: row
+        for row in connection.execute(
+            "SELECT q.question_key, q.question_text, q.difficulty, q.category FROM topic_bank_questions q JOIN topic_bank_tests t ON t.id = q.test_id WHERE t.test_key = ?",
+            (test_key,),
+        )
+    }
+    rows = []
+    for question_key, _selected_answer, is_correct in responses:
+        question = questions.get(question_key)
+        rows.append({
+            "source_type": "topic",
+            "attempt_id": attempt_id,
+            "topic_name": topic_name,
+            "test_name": test_name,
+            "section_name": topic_name,
+            "category_name": question_key,
+            "question_text": question["question_text"] if question else None,
+            "difficulty": question["difficulty"] if question else None,
+            "category": question["category"] if question else None,
+            "is_correct": int(is_correct),
+            "score": score,
+            "completed_at": completed_at,
+        })
+    return rows
+
+
+def _company_recommendation_rows(connection, attempt_id, company_test_id, company, completed_at, score, responses):
+    questions = {
+        row["id"]: row
+        for row in connection.execute(
+            "SELECT id, section, COALESCE(difficulty, 'Medium') AS difficulty FROM company_test_questions WHERE company_test_id = ?",
+            (company_test_id,),
+        )
+    }
+    return [
+        {
+            "source_type": "company",
+            "attempt_id": attempt_id,
+            "topic_name": company["company_name"],
+            "test_name": company["test_name"],
+            "section_name": company["company_name"],
+            "category_name": questions[question_id]["section"],
+            "question_text": None,
+            "difficulty": questions[question_id]["difficulty"],
+            "category": None,
+            "is_correct": int(is_correct),
+            "score": score,
+            "completed_at": completed_at,
+        }
+        for question_id, _selected_answer, is_correct in responses
+        if question_id in questions
+    ]
+
+
 def save_ai_recommendation(user_id, weak_sections, improvement_areas, practice_focus, readiness_score, recommendation_payload=None):
-    return _execute(
-        "INSERT INTO ai_recommendations (user_id, weak_sections, improvement_areas, practice_focus, readiness_score, recommendation_payload) VALUES (?, ?, ?, ?, ?, ?)",
-        (user_id, weak_sections, improvement_areas, practice_focus, readiness_score, recommendation_payload),
+    return _submit_write(
+        _insert_ai_recommendation,
+        user_id,
+        weak_sections,
+        improvement_areas,
+        practice_focus,
+        readiness_score,
+        recommendation_payload,
+        _compressed_history_payload(recommendation_payload),
+        _ai_recommendation_history_limit(),
     )
 
 
+def _insert_ai_recommendation(connection, user_id, weak_sections, improvement_areas, practice_focus, readiness_score, recommendation_payload, compressed_payload, history_limit):
+    recommendation_id = connection.execute(
+        "INSERT INTO ai_recommendations (user_id, weak_sections, improvement_areas, practice_focus, readiness_score, recommendation_payload, payload_zlib) VALUES (?, ?, ?, ?, ?, ?, ?)",
+        (user_id, weak_sections, improvement_areas, practice_focus, readiness_score, None if compressed_payload is not None else recommendation_payload, compressed_payload),
+    ).lastrowid
+    connection.execute(
+        """
+        INSERT INTO ai_recommendation_latest (user_id, id, weak_sections, improvement_areas, practice_focus, recommendation_payload, readiness_score, generated_at)
+        SELECT user_id, id, weak_sections, improvement_areas, practice_focus, ?, readiness_score, generated_at FROM ai_recommendations WHERE id = ?
+        ON CONFLICT (user_id) DO UPDATE SET
+            id = excluded.id,
+            weak_sections = excluded.weak_sections,
+            improvement_areas = excluded.improvement_areas,
+            practice_focus = excluded.practice_focus,
+            recommendation_payload = excluded.recommendation_payload,
+            readiness_score = excluded.readiness_score,
+            generated_at = excluded.generated_at
+        """,
+        (recommendation_payload, recommendation_id),
+    )
+    _trim_ai_recommendation_history(connection, user_id, history_limit)
+    return recommendation_id
+
+
 def get_latest_ai_recommendation(user_id):
-    return _fetch_one("SELECT * FROM ai_recommendations WHERE user_id = ? ORDER BY generated_at DESC LIMIT 1", (user_id,))
+    return _fetch_one("SELECT * FROM ai_recommendation_latest WHERE user_id = ?", (user_id,))
 
 
-def get_admin_students():
-    return _fetch_all(
-        """
-        SELECT u.*, AVG(ta.score) AS avg_score, COUNT(DISTINCT ta.section_id) AS sections_attempted
+def _compressed_history_payload(recommendation_payload):
+    if recommendation_payload is None or not current_app.config.get("AI_RECOMMENDATION_HISTORY_COMPRESS", True):
+        return None
+    return zlib.compress(recommendation_payload.encode("utf-8"))
+
+
+def _ai_recommendation_history_limit():
+    return max(int(current_app.config.get("AI_RECOMMENDATION_HISTORY_LIMIT", 20)), 1)
+
+
+def _trim_ai_recommendation_history(connection, user_id, history_limit):
+    return connection.execute(
+        "DELETE FROM ai_recommendations WHERE user_id = ? AND id <= COALESCE((SELECT id FROM ai_recommendations WHERE user_id = ? ORDER BY id DESC LIMIT 1 OFFSET ?), 0)",
+        (user_id, user_id, history_limit),
+    ).rowcount
+
+
+def start_recommendation_recompute(payload_builder, chunk_size=500, workers=None):
+    return start_maintenance_job("recommendation_recompute", _recompute_recommendations_job, payload_builder, chunk_size, workers)
+
+
+def _recompute_recommendations_job(job_id, payload_builder, chunk_size, workers):
+    return recompute_all_recommendations(payload_builder, chunk_size, workers, job_id)
+
+
+def recompute_all_recommendations(payload_builder, chunk_size=500, workers=None, job_id=None):
+    workers = max(int(workers or current_app.config.get("RECOMMENDATION_RECOMPUTE_WORKERS") or os.cpu_count() or 1), 1)
+    history_limit = _ai_recommendation_history_limit()
+    progress = {
+        "users_total": _fetch_one("SELECT COUNT(*) FROM users WHERE role = 'student'")[0],
+        "users_processed": 0,
+        "users_changed": 0,
+        "users_skipped": 0,
+        "rows_streamed": 0,
+        "chunks": 0,
+        "workers": workers,
+        "elapsed_ms": 0,
+        "users_per_second": 0,
+        "rows_per_second": 0,
+    }
+    started = time.perf_counter()
+    pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) if workers > 1 else None
+    try:
+        last_user_id = 0
+        while True:
+            with _read_transaction() as connection:
+                user_ids = [
+                    row["id"]
+                    for row in connection.execute("SELECT id FROM users WHERE role = 'student' AND id > ? ORDER BY id LIMIT ?", (last_user_id, chunk_size))
+                ]
+                if not user_ids:
+                    break
+                fingerprints = _recommendation_fingerprints(connection, user_ids[0], user_ids[-1])
+                user_rows = {user_id: [] for user_id in user_ids}
+                for row in _recommendation_performance_rows(user_ids[0], user_ids[-1], connection):
+                    if row["user_id"] in user_rows:
+                        user_rows[row["user_id"]].append(tuple(row[column] for column in RECOMMENDATION_ROW_COLUMNS))
+                        progress["rows_streamed"] += 1
+
+            batch_size = -(-len(user_ids) // workers)
+            batches = [list(user_rows.items())[index:index + batch_size] for index in range(0, len(user_ids), batch_size)]
+            if pool is None:
+                results = [_recompute_recommendation_batch(payload_builder, batch) for batch in batches]
+            else:
+                results = list(pool.map(_recompute_recommendation_batch, repeat(payload_builder), batches))
+
+            with _write_transaction() as connection:
+                current_fingerprints = _recommendation_fingerprints(connection, user_ids[0], user_ids[-1])
+                latest_payloads = {
+                    row["user_id"]: row["recommendation_payload"]
+                    for row in connection.execute(
+                        "SELECT user_id, recommendation_payload FROM ai_recommendation_latest WHERE user_id BETWEEN ? AND ?",
+                        (user_ids[0], user_ids[-1]),
+                    )
+                }
+                for user_id, stats, payload in chain.from_iterable(results):
+                    if current_fingerprints.get(user_id) != fingerprints.get(user_id):
+                        progress["users_skipped"] += 1
+                        continue
+                    _reset_recommendation_stats(connection, [user_id])
+                    _merge_recommendation_stats(connection, user_id, stats)
+                    recommendation_payload = json.dumps(payload)
+                    if latest_payloads.get(user_id) == recommendation_payload:
+                        continue
+                    _insert_ai_recommendation(
+                        connection,
+                        user_id,
+                        json.dumps(payload["weak_sections"]),
+                        json.dumps(payload["improvement_areas"]),
+                        payload["practice_focus"],
+                        payload["readiness_score"],
+                        recommendation_payload,
+                        _compressed_history_payload(recommendation_payload),
+                        history_limit,
+                    )
+                    progress["users_changed"] += 1
+
+                elapsed = time.perf_counter() - started
+                progress["users_processed"] += len(user_ids)
+                progress["chunks"] += 1
+                progress["elapsed_ms"] = round(elapsed * 1000, 3)
+                progress["users_per_second"] = round(progress["users_processed"] / elapsed, 2) if elapsed else 0
+                progress["rows_per_second"] = round(progress["rows_streamed"] / elapsed, 2) if elapsed else 0
+                if job_id is not None:
+                    _set_maintenance_job_progress(connection, job_id, progress)
+            if len(user_ids) < chunk_size:
+                break
+            last_user_id = user_ids[-1]
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    return progress
+
+
+def _recommendation_fingerprints(connection, first_user_id, last_user_id):
+    return {
+        row["user_id"]: tuple(row)[1:]
+        for row in connection.execute(
+            """
+            SELECT user_id, COUNT(*) AS attempt_count, MAX(completed_at) AS last_completed_at, TOTAL(score) AS score_sum
+            FROM (
+                SELECT user_id, completed_at, score FROM test_attempts WHERE user_id BETWEEN ? AND ?
+                UNION ALL
+                SELECT user_id, completed_at, score FROM topic_test_attempts WHERE user_id BETWEEN ? AND ?
+                UNION ALL
+                SELECT user_id, completed_at, score FROM company_test_attempts WHERE user_id BETWEEN ? AND ?
+            )
+            GROUP BY user_id
+            """,
+            (first_user_id, last_user_id) * 3,
+        )
+    }
+
+
+def _recompute_recommendation_batch(payload_builder, user_rows):
+    results = []
+    for user_id, rows in user_rows:
+        stats = summarize_recommendation_rows([dict(zip(RECOMMENDATION_ROW_COLUMNS, row)) for row in rows])
+        results.append((user_id, stats, payload_builder(stats)))
+    return results
+
+
+def start_ai_recommendation_compaction(chunk_size=500):
+    return start_maintenance_job("ai_recommendation_compaction", _compact_ai_recommendations_job, chunk_size)
+
+
+def _compact_ai_recommendations_job(job_id, chunk_size):
+    return compact_ai_recommendation_history(chunk_size, job_id)
+
+
+def compact_ai_recommendation_history(chunk_size=500, job_id=None):
+    history_limit = _ai_recommendation_history_limit()
+    compress = current_app.config.get("AI_RECOMMENDATION_HISTORY_COMPRESS", True)
+    progress = {"users_scanned": 0, "rows_deleted": 0, "rows_compressed": 0, "latest_restored": 0}
+    last_user_id = 0
+    while True:
+        with _write_transaction() as connection:
+            user_ids = [
+                row["user_id"]
+                for row in connection.execute("SELECT DISTINCT user_id FROM ai_recommendations WHERE user_id > ? ORDER BY user_id LIMIT ?", (last_user_id, chunk_size))
+            ]
+            if not user_ids:
+                break
+            for user_id in user_ids:
+                progress["rows_deleted"] += _trim_ai_recommendation_history(connection, user_id, history_limit)
+                if connection.execute("SELECT 1 FROM ai_recommendation_latest WHERE user_id = ?", (user_id,)).fetchone() is None:
+                    newest = connection.execute("SELECT * FROM ai_recommendations WHERE user_id = ? ORDER BY id DESC LIMIT 1", (user_id,)).fetchone()
+                    payload = newest["recommendation_payload"]
+                    if newest["payload_zlib"] is not None:
+                        payload = zlib.decompress(newest["payload_zlib"]).decode("utf-8")
+                    connection.execute(
+                        "INSERT INTO ai_recommendation_latest (user_id, id, weak_sections, improvement_areas, practice_focus, recommendation_payload, readiness_score, generated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                        (user_id, newest["id"], newest["weak_sections"], newest["improvement_areas"], newest["practice_focus"], payload, newest["readiness_score"], newest["generated_at"]),
+                    )
+                    progress["latest_restored"] += 1
+                if compress:
+                    updates = [
+                        (zlib.compress(row["recommendation_payload"].encode("utf-8")), row["id"])
+                        for row in connection.execute(
+                            "SELECT id, recommendation_payload FROM ai_recommendations WHERE user_id = ? AND recommendation_payload IS NOT NULL AND payload_zlib IS NULL",
+                            (user_id,),
+                        )
+                    ]
+                    connection.executemany("UPDATE ai_recommendations SET payload_zlib = ?, recommendation_payload = NULL WHERE id = ?", updates)
+                    progress["rows_compressed"] += len(updates)
+            progress["users_scanned"] += len(user_ids)
+            if job_id is not None:
+                _set_maintenance_job_progress(connection, job_id, progress)
+        if len(user_ids) < chunk_size:
+            break
+        last_user_id = user_ids[-1]
+    return progress
+
+
+def get_admin_students(after=None, limit=None):
+    return _fetch_all(*_admin_students_query(after, limit), connection=get_report_db())
+
+
+def iter_admin_students(after=None, limit=None):
+    return _iter_rows(*_admin_students_query(after, limit), connection=get_report_db())
+
+
+def _admin_students_query(after, limit):
+    keyset_filter = "AND u.id > ?" if after else ""
+    query = f"""
+        SELECT u.*,
+               CASE WHEN ss.total_attempts > 0 THEN ss.score_sum / ss.total_attempts END AS avg_score,
+               COALESCE(ss.sections_attempted, 0) AS sections_attempted,
+               COALESCE(ss.total_attempts, 0) AS total_attempts,
+               ss.last_attempt_at
         FROM users u
-        LEFT JOIN test_attempts ta ON u.id = ta.user_id
-        WHERE u.role = 'student'
-        GROUP BY u.id
+        LEFT JOIN student_summaries ss ON ss.user_id = u.id
+        WHERE u.role = 'student' {keyset_filter}
         ORDER BY u.id
+        LIMIT ?
         """
-    )
+    params = (*(after or ()), -1 if limit is None else limit)
+    return query, params
 
 
 def get_admin_department_stats():
     return _fetch_all(
         """
-        SELECT u.department, COUNT(DISTINCT u.id) AS student_count, AVG(ta.score) AS avg_score, COUNT(ta.id) AS total_attempts
-        FROM users u
-        LEFT JOIN test_attempts ta ON u.id = ta.user_id
-        WHERE u.role = 'student' AND u.department IS NOT NULL
-        GROUP BY u.department
-        ORDER BY u.department
-        """
+        SELECT department, student_count,
+               CASE WHEN total_attempts > 0 THEN score_sum / total_attempts END AS avg_score,
+               total_attempts
+        FROM department_summaries
+        WHERE student_count > 0
+        ORDER BY department
+        """,
+        connection=get_report_db(),
     )
 
 
@@ -749,27 +2579,511 @@ def save_resume_ai_suggestions(user_id, resume_text, job_description_text, sugge
     )
 
 
-def reset_demo_data():
-    connection = get_db()
+def pack_stored_responses(chunk_size=500):
+    results = {}
+    for kind, (attempt_table, owner_column, response_table, key_column) in PACKED_RESPONSE_SOURCES.items():
+        counts = {"packed": 0, "skipped": 0}
+        question_orders = {}
+        last_id = 0
+        while True:
+            with _write_transaction() as connection:
+                attempts = connection.execute(
+                    f"SELECT id, {owner_column} AS owner FROM {attempt_table} WHERE packed_responses IS NULL AND id > ? ORDER BY id LIMIT ?",
+                    (last_id, chunk_size),
+                ).fetchall()
+                for attempt in attempts:
+                    if attempt["owner"] not in question_orders:
+                        question_orders[attempt["owner"]] = _question_order(connection, kind, attempt["owner"])
+                    question_keys = question_orders[attempt["owner"]]
+                    responses = {
+                        row[key_column]: (row["selected_answer"], row["is_correct"])
+                        for row in connection.execute(f"SELECT {key_column}, selected_answer, is_correct FROM {response_table} WHERE attempt_id = ?", (attempt["id"],))
+                    }
+                    if not responses or set(responses) != set(question_keys) or not all(_is_packable_answer(answer) for answer, _is_correct in responses.values()):
+                        counts["skipped"] += 1
+                        continue
+                    connection.execute(
+                        f"UPDATE {attempt_table} SET packed_responses = ?, total_questions = ? WHERE id = ?",
+                        (encode_packed_responses([responses[question_key] for question_key in question_keys]), len(question_keys), attempt["id"]),
+                    )
+                    connection.execute(f"DELETE FROM {response_table} WHERE attempt_id = ?", (attempt["id"],))
+                    counts["packed"] += 1
+            if len(attempts) < chunk_size:
+                break
+            last_id = attempts[-1]["id"]
+        results[kind] = counts
+    return results
+
+
+def _unpack_attempt_responses(connection, kind, owner, question_keys):
+    attempt_table, owner_column, response_table, key_column = PACKED_RESPONSE_SOURCES[kind]
+    attempts = connection.execute(
+        f"SELECT id, total_questions, packed_responses FROM {attempt_table} WHERE {owner_column} = ? AND packed_responses IS NOT NULL",
+        (owner,),
+    ).fetchall()
+    for attempt in attempts:
+        connection.executemany(
+            f"INSERT INTO {response_table} (attempt_id, {key_column}, selected_answer, is_correct) VALUES (?, ?, ?, ?)",
+            [(attempt["id"], response[key_column], response["selected_answer"], response["is_correct"]) for response in _decode_attempt_responses(attempt, question_keys, key_column)],
+        )
+    connection.executemany(f"UPDATE {attempt_table} SET packed_responses = NULL WHERE id = ?", [(attempt["id"],) for attempt in attempts])
+    return len(attempts)
+
+
+def _question_order(connection, kind, owner):
+    if kind == "topic":
+        return _topic_question_keys(owner)
+    if kind == "company":
+        return [row["id"] for row in connection.execute("SELECT id FROM company_test_questions WHERE company_test_id = ? ORDER BY id", (owner,))]
+    return [row["id"] for row in connection.execute("SELECT id FROM questions WHERE section_id = ? ORDER BY id", (owner,))]
+
+
+def _is_packable_answer(selected_answer):
+    answer = str(selected_answer or "").strip().upper()
+    return not answer or (len(answer) == 1 and answer in PACKED_ANSWER_CODES)
+
+
+def start_answer_key_regrade(kind, question_id, correct_answer, chunk_size=5000):
+    correct_answer = str(correct_answer or "").strip().upper()
+    if kind not in ANSWER_KEY_SOURCES:
+        raise ValueError(f"Unsupported question kind: {kind}")
+    if len(correct_answer) != 1 or correct_answer not in PACKED_ANSWER_CODES:
+        raise ValueError("correct_answer must be one of A, B, C or D")
+
+    question_table, owner_column, key_column = ANSWER_KEY_SOURCES[kind]
+    with _write_transaction() as connection:
+        question = connection.execute(
+            f"SELECT id, {owner_column} AS owner, {key_column} AS response_key, correct_answer FROM {question_table} WHERE {'question_id' if kind == 'topic' else 'id'} = ?",
+            (question_id,),
+        ).fetchone()
+        if question is None:
+            return None
+        active_job_id = _active_maintenance_job_id(connection, "answer_key_regrade")
+        if active_job_id:
+            raise MaintenanceJobConflict(get_maintenance_job(active_job_id))
+
+        if kind == "topic":
+            connection.execute("UPDATE topic_bank_questions SET correct_answer = ? WHERE question_key = ?", (correct_answer, question["response_key"]))
+            _bump_topic_bank_version(connection)
+            targets = [
+                (row["test_key"], row["position"])
+                for row in connection.execute(
+                    """
+                    SELECT t.test_key,
+                           (SELECT COUNT(*) FROM topic_bank_questions earlier WHERE earlier.test_id = q.test_id AND earlier.question_order < q.question_order) AS position
+                    FROM topic_bank_questions q
+                    JOIN topic_bank_tests t ON t.id = q.test_id
+                    WHERE q.question_key = ?
+                    ORDER BY t.id, q.question_order
+                    """,
+                    (question["response_key"],),
+                )
+            ]
+        else:
+            connection.execute(f"UPDATE {question_table} SET correct_answer = ? WHERE id = ?", (correct_answer, question["id"]))
+            position = connection.execute(
+                f"SELECT COUNT(*) FROM {question_table} WHERE {owner_column} = ? AND id < ?",
+                (question["owner"], question["id"]),
+            ).fetchone()[0]
+            targets = [(question["owner"], position)]
+        job_id = connection.execute("INSERT INTO maintenance_jobs (job_type, status) VALUES ('answer_key_regrade', 'queued')").lastrowid
+
+    _launch_maintenance_job(job_id, "answer_key_regrade", _regrade_answer_key, (kind, targets, question["response_key"], correct_answer, chunk_size))
+    return get_maintenance_job(job_id)
+
+
+def _regrade_answer_key(job_id, kind, targets, response_key, correct_answer, chunk_size):
+    progress = {
+        "kind": kind,
+        "owners": [owner for owner, _position in targets],
+        "question": response_key,
+        "correct_answer": correct_answer,
+        "engine": "numpy" if np is not None else "python",
+        "attempts_scanned": 0,
+        "responses_changed": 0,
+        "attempts_regraded": 0,
+        "users_affected": 0,
+    }
+    affected_users = set()
+    started = time.perf_counter()
+    for owner, position in targets:
+        _regrade_owner_attempts(job_id, kind, owner, response_key, position, correct_answer, chunk_size, progress, affected_users)
+
+    affected_users = sorted(affected_users)
+    for index in range(0, len(affected_users), SUMMARY_REBUILD_CHUNK_SIZE):
+        user_ids = affected_users[index:index + SUMMARY_REBUILD_CHUNK_SIZE]
+        with _write_transaction() as connection:
+            for user_id in user_ids:
+                _rebuild_user_section_stats(connection, user_id)
+            _rebuild_admin_summaries(connection, user_ids)
+            connection.executemany("DELETE FROM ai_recommendations WHERE user_id = ?", [(user_id,) for user_id in user_ids])
+            connection.executemany("DELETE FROM ai_recommendation_latest WHERE user_id = ?", [(user_id,) for user_id in user_ids])
+            _reset_recommendation_stats(connection, user_ids)
+    progress["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 3)
+    return progress
+
+
+def _regrade_owner_attempts(job_id, kind, owner, response_key, position, correct_answer, chunk_size, progress, affected_users):
+    attempt_table, owner_column, response_table, key_column = PACKED_RESPONSE_SOURCES[kind]
+    with _write_transaction() as connection:
+        if kind == "test":
+            points = [row["points"] for row in connection.execute("SELECT points FROM questions WHERE section_id = ? ORDER BY id", (owner,))]
+        else:
+            points = None
+
+    last_id = 0
+    while True:
+        with _write_transaction() as connection:
+            attempts = connection.execute(
+                f"SELECT id, user_id, score, correct_answers, total_questions, packed_responses FROM {attempt_table} WHERE {owner_column} = ? AND id > ? ORDER BY id LIMIT ?",
+                (owner, last_id, chunk_size),
+            ).fetchall()
+            if not attempts:
+                break
+            first_id, last_id = attempts[0]["id"] - 1, attempts[-1]["id"]
+
+            progress["responses_changed"] += connection.execute(
+                f"""
+                UPDATE {response_table}
+                SET is_correct = (UPPER(COALESCE(selected_answer, '')) = ?)
+                WHERE {key_column} = ?
+                  AND is_correct IS NOT (UPPER(COALESCE(selected_answer, '')) = ?)
+                  AND attempt_id IN (SELECT id FROM {attempt_table} WHERE {owner_column} = ? AND id > ? AND id <= ? AND packed_responses IS NULL)
+                """,
+                (correct_answer, response_key, correct_answer, owner, first_id, last_id),
+            ).rowcount
+            graded = _regraded_row_attempts(connection, kind, owner, first_id, last_id)
+            graded.update(_regrade_packed_attempts([attempt for attempt in attempts if attempt["packed_responses"] is not None], position, PACKED_ANSWER_CODES.index(correct_answer), points))
+
+            total_points = sum(points) if points else 0
+            updates = []
+            for attempt in attempts:
+                if attempt["id"] not in graded:
+                    continue
+                correct_count, earned_points, packed_responses = graded[attempt["id"]]
+                if kind == "test":
+                    score = (earned_points / total_points * 100) if total_points > 0 else 0
+                else:
+                    score = round((correct_count / attempt["total_questions"]) * 100, 2) if attempt["total_questions"] else 0
+                if correct_count == attempt["correct_answers"] and score == attempt["score"] and packed_responses in (None, attempt["packed_responses"]):
+                    continue
+                updates.append((correct_count, score, packed_responses, attempt["id"]))
+                affected_users.add(attempt["user_id"])
+            connection.executemany(
+                f"UPDATE {attempt_table} SET correct_answers = ?, score = ?, packed_responses = COALESCE(?, packed_responses) WHERE id = ?",
+                updates,
+            )
+            progress["attempts_scanned"] += len(attempts)
+            progress["attempts_regraded"] += len(updates)
+            progress["users_affected"] = len(affected_users)
+            _set_maintenance_job_progress(connection, job_id, progress)
+        if len(attempts) < chunk_size:
+            break
+
+
+def _regraded_row_attempts(connection, kind, owner, first_id, last_id):
+    attempt_table, owner_column, response_table, _key_column = PACKED_RESPONSE_SOURCES[kind]
+    if kind == "test":
+        earned_points_sql = "SUM(CASE WHEN r.is_correct = 1 THEN q.points ELSE 0 END)"
+        points_join = "JOIN questions q ON q.id = r.question_id"
+    else:
+        earned_points_sql = "NULL"
+        points_join = ""
+    rows = connection.execute(
+        f"""
+        SELECT r.attempt_id, SUM(CASE WHEN r.is_correct = 1 THEN 1 ELSE 0 END) AS correct_count, {earned_points_sql} AS earned_points
+        FROM {response_table} r
+        JOIN {attempt_table} a ON a.id = r.attempt_id
+        {points_join}
+        WHERE a.{owner_column} = ? AND a.id > ? AND a.id <= ? AND a.packed_responses IS NULL
+        GROUP BY r.attempt_id
+        """,
+        (owner, first_id, last_id),
+    ).fetchall()
+    return {row["attempt_id"]: (row["correct_count"], row["earned_points"] or 0, None) for row in rows}
+
+
+def _regrade_packed_attempts(attempts, position, answer_code, points=None):
+    graded = {}
+    attempts_by_count = {}
+    for attempt in attempts:
+        attempts_by_count.setdefault(attempt["total_questions"] or 0, []).append(attempt)
+
+    for count, group in attempts_by_count.items():
+        codes_length = (count + 3) // 4
+        bitmap_length = (count + 7) // 8
+        group = [attempt for attempt in group if position < count and len(attempt["packed_responses"]) == codes_length + 2 * bitmap_length]
+        if not group:
+            continue
+        question_points = (points or [])[:count]
+
+        if np is None:
+            for attempt in group:
+                decoded = decode_packed_responses(attempt["packed_responses"], count)
+                selected_answer = decoded[position][0]
+                decoded[position] = (selected_answer, int(selected_answer == PACKED_ANSWER_CODES[answer_code]))
+                earned_points = sum(value for value, (_answer, is_correct) in zip(question_points, decoded) if is_correct)
+                graded[attempt["id"]] = (sum(is_correct for _answer, is_correct in decoded), earned_points, encode_packed_responses(decoded))
+            continue
+
+        matrix = np.frombuffer(b"".join(attempt["packed_responses"] for attempt in group), dtype=np.uint8).reshape(len(group), -1).copy()
+        codes = (matrix[:, position // 4] >> (position % 4 * 2)) & 3
+        answered = (matrix[:, codes_length + position // 8] >> (position % 8)) & 1
+        is_correct = (answered == 1) & (codes == answer_code)
+        correct_byte = codes_length + bitmap_length + position // 8
+        correct_mask = np.uint8(1 << (position % 8))
+        matrix[:, correct_byte] = np.where(is_correct, matrix[:, correct_byte] | correct_mask, matrix[:, correct_byte] & ~correct_mask)
+        correct_bits = np.unpackbits(matrix[:, codes_length + bitmap_length:], axis=1, bitorder="little")[:, :count]
+        correct_counts = correct_bits.sum(axis=1)
+        if len(question_points) == count:
+            earned_points = correct_bits @ np.asarray(question_points, dtype=np.float64)
+        else:
+            earned_points = np.zeros(len(group))
+        for index, attempt in enumerate(group):
+            graded[attempt["id"]] = (int(correct_counts[index]), float(earned_points[index]), matrix[index].tobytes())
+    return graded
+
+
+def start_demo_data_purge(chunk_size=5000):
+    return start_maintenance_job("demo_data_purge", _purge_demo_data, chunk_size)
+
+
+def _purge_demo_data(job_id, chunk_size):
+    protected_users_query = f"SELECT id FROM users WHERE username IN ({', '.join('?' for _ in PROTECTED_DEMO_USERS)})"
     deleted_rows = {}
-    protected_users = ("admin", "student1")
-    protected_query = "SELECT id FROM users WHERE username IN (?, ?)"
+    for attempt_table, response_table in DEMO_DATA_PURGE_ATTEMPT_STEPS:
+        deleted_rows[response_table] = 0
+        deleted_rows[attempt_table] = 0
+        attempt_ids_query = f"SELECT id FROM {attempt_table} WHERE user_id NOT IN ({protected_users_query}) ORDER BY id LIMIT ?"
+        while True:
+            with _write_transaction() as connection:
+                deleted_rows[response_table] += connection.execute(
+                    f"DELETE FROM {response_table} WHERE attempt_id IN ({attempt_ids_query})",
+                    PROTECTED_DEMO_USERS + (chunk_size,),
+                ).rowcount
+                cursor = connection.execute(
+                    f"DELETE FROM {attempt_table} WHERE id IN ({attempt_ids_query})",
+                    PROTECTED_DEMO_USERS + (chunk_size,),
+                )
+                deleted_rows[attempt_table] += cursor.rowcount
+                _set_maintenance_job_progress(connection, job_id, {"current_table": attempt_table, "deleted_rows": deleted_rows})
+            if cursor.rowcount < chunk_size:
+                break
+
+    for table_name in DEMO_DATA_PURGE_STEPS:
+        deleted_rows[table_name] = 0
+        while True:
+            with _write_transaction() as connection:
+                cursor = connection.execute(
+                    f"DELETE FROM {table_name} WHERE rowid IN (SELECT rowid FROM {table_name} WHERE user_id NOT IN ({protected_users_query}) LIMIT ?)",
+                    PROTECTED_DEMO_USERS + (chunk_size,),
+                )
+                deleted_rows[table_name] += cursor.rowcount
+                _set_maintenance_job_progress(connection, job_id, {"current_table": table_name, "deleted_rows": deleted_rows})
+            if cursor.rowcount < chunk_size:
+                break
+
+    with _write_transaction() as connection:
+        _rebuild_user_section_stats(connection)
+        _rebuild_admin_summaries(connection)
+    return {"deleted_rows": deleted_rows}
+
+
+def start_maintenance_job(job_type, worker, *args):
+    with _write_transaction() as connection:
+        active_job_id = _active_maintenance_job_id(connection, job_type)
+        if active_job_id:
+            return get_maintenance_job(active_job_id)
+        job_id = connection.execute("INSERT INTO maintenance_jobs (job_type, status) VALUES (?, 'queued')", (job_type,)).lastrowid
+    _launch_maintenance_job(job_id, job_type, worker, args)
+    return get_maintenance_job(job_id)
+
+
+def _active_maintenance_job_id(connection, job_type):
+    active_job = connection.execute(
+        "SELECT id FROM maintenance_jobs WHERE job_type = ? AND status IN ('queued', 'running') AND updated_at >= datetime('now', ?) ORDER BY id DESC LIMIT 1",
+        (job_type, f"-{MAINTENANCE_JOB_STALE_MINUTES} minutes"),
+    ).fetchone()
+    return active_job["id"] if active_job else None
+
+
+def _launch_maintenance_job(job_id, job_type, worker, args):
+    app = current_app._get_current_object()
+    threading.Thread(target=_run_maintenance_job, args=(app, job_id, worker, args), name=f"{job_type}-{job_id}", daemon=True).start()
+
+
+def get_maintenance_job(job_id=None, job_type=None):
+    if job_id is not None:
+        row = _fetch_one("SELECT * FROM maintenance_jobs WHERE id = ?", (job_id,))
+    else:
+        row = _fetch_one("SELECT * FROM maintenance_jobs WHERE job_type = ? ORDER BY id DESC LIMIT 1", (job_type,))
+    if not row:
+        return None
+    job = dict(row)
+    job["progress"] = json.loads(job["progress"]) if job["progress"] else {}
+    return job
+
+
+def _run_maintenance_job(app, job_id, worker, args):
+    with app.app_context():
+        _execute("UPDATE maintenance_jobs SET status = 'running', started_at = CURRENT_TIMESTAMP, updated_at = CURRENT_TIMESTAMP WHERE id = ?", (job_id,))
+        try:
+            progress = worker(job_id, *args)
+        except Exception as error:
+            app.logger.exception("Maintenance job %s failed", job_id)
+            _execute(
+                "UPDATE maintenance_jobs SET status = 'failed', error = ?, finished_at = CURRENT_TIMESTAMP, updated_at = CURRENT_TIMESTAMP WHERE id = ?",
+                (str(error), job_id),
+            )
+            return
+        _execute(
+            "UPDATE maintenance_jobs SET status = 'completed', progress = ?, finished_at = CURRENT_TIMESTAMP, updated_at = CURRENT_TIMESTAMP WHERE id = ?",
+            (json.dumps(progress), job_id),
+        )
+
+
+def _set_maintenance_job_progress(connection, job_id, progress):
+    connection.execute("UPDATE maintenance_jobs SET progress = ?, updated_at = CURRENT_TIMESTAMP WHERE id = ?", (json.dumps(progress), job_id))
+
+
+def start_database_backup():
+    return start_maintenance_job("database_backup", _backup_database_job)
+
+
+def _backup_database_job(_job_id):
+    return create_database_backup()
+
+
+def create_database_backup():
+    config = current_app.config
+    database_path = Path(config["DATABASE_PATH"])
+    backup_folder = _backup_folder()
+    backup_folder.mkdir(parents=True, exist_ok=True)
+    snapshot_path = backup_folder / f"{database_path.stem}-{time.strftime('%Y%m%d-%H%M%S')}.db"
+    partial_path = backup_folder / f"{snapshot_path.name}.{os.getpid()}.partial"
+    pages_per_step = max(int(config.get("BACKUP_PAGES_PER_STEP", 256)), 1)
+    step_sleep = max(float(config.get("BACKUP_STEP_SLEEP_MS", 5)), 0) / 1000
+
+    def pause_between_steps(_status, remaining, _total):
+        if remaining and step_sleep:
+            time.sleep(step_sleep)
+
+    started = time.perf_counter()
     try:
-        connection.execute("BEGIN")
-        cursor = connection.execute(f"DELETE FROM user_responses WHERE attempt_id IN (SELECT id FROM test_attempts WHERE user_id NOT IN ({protected_query}))", protected_users)
-        deleted_rows["user_responses"] = cursor.rowcount
-        cursor = connection.execute(f"DELETE FROM company_test_responses WHERE attempt_id IN (SELECT id FROM company_test_attempts WHERE user_id NOT IN ({protected_query}))", protected_users)
-        deleted_rows["company_test_responses"] = cursor.rowcount
-        cursor = connection.execute(f"DELETE FROM test_attempts WHERE user_id NOT IN ({protected_query})", protected_users)
-        deleted_rows["test_attempts"] = cursor.rowcount
-        cursor = connection.execute(f"DELETE FROM company_test_attempts WHERE user_id NOT IN ({protected_query})", protected_users)
-        deleted_rows["company_test_attempts"] = cursor.rowcount
-        cursor = connection.execute(f"DELETE FROM resumes WHERE user_id NOT IN ({protected_query})", protected_users)
-        deleted_rows["resumes"] = cursor.rowcount
-        cursor = connection.execute(f"DELETE FROM ai_recommendations WHERE user_id NOT IN ({protected_query})", protected_users)
-        deleted_rows["ai_recommendations"] = cursor.rowcount
-        connection.commit()
-        return deleted_rows
-    except Exception:
-        connection.rollback()
-        raise
+        with closing(_open_connection(str(database_path), config, read_only=True)) as source, closing(sqlite3.connect(partial_path)) as target:
+            source.backup(target, pages=pages_per_step, progress=pause_between_steps)
+            target.execute("PRAGMA journal_mode = DELETE")
+        os.replace(partial_path, snapshot_path)
+    finally:
+        if partial_path.exists():
+            partial_path.unlink()
+
+    removed = [path.name for path in list_database_snapshots(paths_only=True)[max(int(config.get("BACKUP_RETENTION", 24)), 1):]]
+    for name in removed:
+        (backup_folder / name).unlink(missing_ok=True)
+    return {
+        "snapshot": snapshot_path.name,
+        "size_bytes": snapshot_path.stat().st_size,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 3),
+        "removed_snapshots": removed,
+    }
+
+
+def list_database_snapshots(paths_only=False):
+    backup_folder = _backup_folder()
+    if not backup_folder.is_dir():
+        return []
+    paths = sorted(backup_folder.glob(f"{Path(current_app.config['DATABASE_PATH']).stem}-*.db"), reverse=True)
+    if paths_only:
+        return paths
+    snapshots = []
+    for path in paths:
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            continue
+        snapshots.append({
+            "snapshot": path.name,
+            "size_bytes": stat.st_size,
+            "created_at": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(stat.st_mtime)),
+        })
+    return snapshots
+
+
+def latest_database_snapshot():
+    paths = list_database_snapshots(paths_only=True)
+    return paths[0] if paths else None
+
+
+def _backup_folder():
+    configured_folder = current_app.config.get("BACKUP_FOLDER")
+    if configured_folder:
+        return Path(configured_folder)
+    return Path(current_app.config["DATABASE_PATH"]).parent / "backups"
+
+
+def get_report_db():
+    if current_app.config.get("ADMIN_REPORTS_FROM_SNAPSHOT"):
+        snapshot_path = latest_database_snapshot()
+        if snapshot_path is not None:
+            return _acquire_snapshot_connection(str(snapshot_path), current_app.config)
+    return _query_db()
+
+
+def _acquire_snapshot_connection(snapshot_path, config):
+    pooled = getattr(CONNECTION_POOL, "snapshot", None)
+    if pooled is not None:
+        owner_pid, pooled_path, connection = pooled
+        if owner_pid == os.getpid() and pooled_path == snapshot_path and _connection_is_healthy(connection):
+            return connection
+        if owner_pid == os.getpid():
+            _close_quietly(connection)
+
+    connection = _open_connection(snapshot_path, config, read_only=True)
+    CONNECTION_POOL.snapshot = (os.getpid(), snapshot_path, connection)
+    return connection
+
+
+def ensure_backup_scheduler():
+    interval_minutes = float(current_app.config.get("BACKUP_INTERVAL_MINUTES", 0))
+    if interval_minutes <= 0 or current_app.config.get("_BACKUP_SCHEDULER_PID") == os.getpid():
+        return
+
+    with INITIALIZATION_LOCK:
+        if current_app.config.get("_BACKUP_SCHEDULER_PID") == os.getpid():
+            return
+        current_app.config["_BACKUP_SCHEDULER_PID"] = os.getpid()
+        threading.Thread(
+            target=_run_backup_scheduler,
+            args=(current_app._get_current_object(), interval_minutes * 60),
+            name="sqlite-backup",
+            daemon=True,
+        ).start()
+
+
+def _run_backup_scheduler(app, interval_seconds):
+    with app.app_context():
+        backup_folder = _backup_folder()
+        backup_folder.mkdir(parents=True, exist_ok=True)
+        with open(backup_folder / "scheduler.lock", "a+") as lock_file:
+            holds_lock = fcntl is None
+            while True:
+                if not holds_lock:
+                    try:
+                        fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                        holds_lock = True
+                    except OSError:
+                        pass
+
+                wait_seconds = interval_seconds
+                if holds_lock:
+                    latest_snapshot = latest_database_snapshot()
+                    age_seconds = time.time() - latest_snapshot.stat().st_mtime if latest_snapshot else None
+                    if age_seconds is None or age_seconds >= interval_seconds:
+                        try:
+                            create_database_backup()
+                        except Exception:
+                            app.logger.exception("Scheduled database backup failed")
+                    else:
+                        wait_seconds = interval_seconds - age_seconds
+                time.sleep(max(wait_seconds, 1))
@@ -2,20 +2,11 @@ import json
 import sqlite3
 from pathlib import Path
 
-from flask import Blueprint, current_app, jsonify, redirect, render_template, request, send_file, session, url_for
+from flask import Blueprint, Response, current_app, jsonify, redirect, render_template, request, send_file, session, stream_with_context, url_for
 
-from data.test_catalog import TOPIC_TEST_CATALOG
 from db import (
-    create_company_test_attempt,
-    create_company_test_response,
-    create_test_attempt,
-    create_topic_attempt,
-    create_topic_response,
+    MaintenanceJobConflict,
     create_user,
-    create_user_response,
-    finalize_company_test_attempt,
-    finalize_test_attempt,
-    finalize_topic_attempt,
     get_admin_department_stats,
     get_admin_students,
     get_company_test,
@@ -25,39 +16,64 @@ from db import (
     get_company_test_responses,
     get_company_tests_for_user,
     get_latest_ai_recommendation,
+    get_maintenance_job,
+    get_query_metrics,
     get_questions_for_section,
-    get_recommendation_performance,
+    get_recommendation_stats,
     get_resume_for_user,
     get_section_performance,
     get_test_sections,
     get_topic_attempt,
+    get_topic_attempt_marker,
+    get_topic_bank_cache_stats,
+    get_topic_bank_listing,
+    get_topic_bank_version,
     get_topic_attempts_for_user,
     get_topic_responses,
+    get_topic_test,
     get_user_by_credentials,
     get_user_scores,
-    reset_demo_data,
+    has_topic_attempt,
+    iter_admin_students,
+    iter_company_tests_for_user,
+    iter_user_scores,
+    list_database_snapshots,
+    record_company_test_attempt,
+    record_test_attempt,
+    record_topic_attempt,
+    start_ai_recommendation_compaction,
+    start_answer_key_regrade,
+    start_recommendation_recompute,
+    start_database_backup,
+    start_demo_data_purge,
     save_ai_recommendation,
     save_resume_ai_suggestions,
+    schedule_recommendation_refresh,
     upsert_resume_for_user,
+    wait_for_recommendation_refresh,
 )
 from utils import (
     ALLOWED_JD_EXTENSIONS,
     ALLOWED_RESUME_EXTENSIONS,
     DEFAULT_JOB_DESCRIPTION,
-    TOPIC_TEST_MAP,
     build_ai_recommendation_payload,
+    build_topic_test_listing,
     build_tailored_resume,
     build_test_performance_feedback,
     calculate_resume_score,
     compute_capability_match_scores,
     count_projects,
     current_time,
+    decode_cursor,
     detect_resume_type,
+    encode_cursor,
     extract_uploaded_document_text,
     generate_resume_ai_chat_reply,
     generate_resume_ai_suggestions,
     generate_resume_files,
+    render_topic_test_questions,
     score_skills_with_evidence,
+    topic_test_listing_etag,
 )
 from nlp.matcher import SkillMatcher
 from nlp.scorer import ResumeScorer
@@ -67,6 +83,8 @@ from nlp.text_preprocessing import TextPreprocessor
 
 routes_bp = Blueprint("routes", __name__)
 
+MAX_PAGE_SIZE = 500
+
 
 @routes_bp.route("/health")
 def health():
@@ -175,36 +193,17 @@ def api_topic_tests():
     if "user_id" not in session:
         return jsonify({"success": False, "message": "Not logged in"}), 401
 
-    attempts = get_topic_attempts_for_user(session["user_id"])
-    attempt_map = {row["test_key"]: dict(row) for row in attempts}
-    payload = []
-    for topic in TOPIC_TEST_CATALOG:
-        topic_payload = {
-            "topic_name": topic["topic_name"],
-            "topic_key": topic.get("topic_key"),
-            "description": topic["description"],
-            "test_count": topic["test_count"],
-            "tests": [],
-        }
-        for test in topic["tests"]:
-            attempt = attempt_map.get(test["test_id"])
-            topic_payload["tests"].append(
-                {
-                    "test_id": test["test_id"],
-                    "test_name": test["test_name"],
-                    "description": test["description"],
-                    "question_count": len(test["questions"]),
-                    "time_limit": test["time_limit"],
-                    "difficulty_tags": sorted({question.get("difficulty", "Medium") for question in test["questions"]}),
-                    "attempted": bool(attempt),
-                    "status": "Attempted" if attempt else "Not Attempted",
-                    "score": attempt["score"] if attempt else None,
-                    "completed_at": attempt["completed_at"] if attempt else None,
-                    "solution_unlocked": bool(attempt),
-                }
-            )
-        payload.append(topic_payload)
-    return jsonify(payload)
+    attempt_count, latest_attempt_id = get_topic_attempt_marker(session["user_id"])
+    etag = topic_test_listing_etag(get_topic_bank_version(), session["user_id"], attempt_count, latest_attempt_id)
+    if request.if_none_match.contains_weak(etag):
+        response = Response(status=304)
+    else:
+        attempts = get_topic_attempts_for_user(session["user_id"]) if attempt_count else []
+        response = jsonify(build_topic_test_listing(get_topic_bank_listing(), {row["test_key"]: row for row in attempts}))
+    response.set_etag(etag)
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response
 
 
 @routes_bp.route("/api/topic_tests/<test_id>/questions", methods=["GET"])
@@ -212,33 +211,18 @@ def api_topic_test_questions(test_id):
     if "user_id" not in session:
         return jsonify({"success": False, "message": "Not logged in"}), 401
 
-    test = TOPIC_TEST_MAP.get(test_id)
+    test = get_topic_test(test_id)
     if not test:
         return jsonify({"success": False, "message": "Test not found"}), 404
-    if get_topic_attempt(session["user_id"], test_id):
+    if has_topic_attempt(session["user_id"], test_id):
         return jsonify({"success": False, "message": "This test has already been attempted."}), 400
 
-    return jsonify(
-        {
-            "test_id": test["test_id"],
-            "test_name": test["test_name"],
-            "topic_name": test["topic_name"],
-            "topic_key": test["topic_key"],
-            "time_limit": test["time_limit"],
-            "questions": [
-                {
-                    "question_id": question["question_id"],
-                    "question_text": question["question_text"],
-                    "option_a": question["options"]["A"],
-                    "option_b": question["options"]["B"],
-                    "option_c": question["options"]["C"],
-                    "option_d": question["options"]["D"],
-                    "difficulty": question.get("difficulty", "Medium"),
-                }
-                for question in test["questions"]
-            ],
-        }
-    )
+    body, etag = render_topic_test_questions(test, get_topic_bank_version())
+    response = Response(body, mimetype="application/json")
+    response.set_etag(etag)
+    response.cache_control.private = True
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
 
 
 @routes_bp.route("/api/topic_tests/<test_id>/submit", methods=["POST"])
@@ -246,7 +230,7 @@ def api_submit_topic_test(test_id):
     if "user_id" not in session:
         return jsonify({"success": False, "message": "Not logged in"}), 401
 
-    test = TOPIC_TEST_MAP.get(test_id)
+    test = get_topic_test(test_id)
     if not test:
         return jsonify({"success": False, "message": "Test not found"}), 404
     if get_topic_attempt(session["user_id"], test_id):
@@ -256,23 +240,27 @@ def api_submit_topic_test(test_id):
     answers = data.get("answers", {})
     time_taken = data.get("time_taken", 0)
     correct_count = 0
+    responses = []
 
-    attempt_id = create_topic_attempt(session["user_id"], test["test_id"], test["topic_name"], test["test_name"], len(test["questions"]), time_taken, current_time())
     for question in test["questions"]:
         selected_answer = (answers.get(question["question_id"]) or "").upper()
         is_correct = selected_answer == question["correct_answer"]
         if is_correct:
             correct_count += 1
-        create_topic_response(attempt_id, question["question_key"], selected_answer, is_correct)
+        responses.append((question["question_key"], selected_answer, is_correct))
 
     score = round((correct_count / len(test["questions"])) * 100, 2) if test["questions"] else 0
-    finalize_topic_attempt(attempt_id, score, correct_count)
-    _generate_ai_recommendations(session["user_id"])
-    topic_group = next((topic for topic in TOPIC_TEST_CATALOG if topic["topic_key"] == test["topic_key"]), {})
+    try:
+        attempt_id = record_topic_attempt(session["user_id"], test["test_id"], test["topic_name"], test["test_name"], time_taken, current_time(), responses, score, correct_count)
+    except sqlite3.IntegrityError:
+        return jsonify({"success": False, "message": "Each topic test can only be attempted once."}), 400
+    schedule_recommendation_refresh(session["user_id"], _generate_ai_recommendations)
+    topic_tests = next((tests for topic, tests in get_topic_bank_listing() if topic["topic_key"] == test["topic_key"]), ())
+    attempted_test_ids = {row["test_key"] for row in get_topic_attempts_for_user(session["user_id"])}
     recommendation_pool = [
         other_test["test_name"]
-        for other_test in topic_group.get("tests", [])
-        if other_test["test_id"] != test_id and not get_topic_attempt(session["user_id"], other_test["test_id"])
+        for other_test in topic_tests
+        if other_test["test_id"] != test_id and other_test["test_id"] not in attempted_test_ids
     ]
     performance_feedback = build_test_performance_feedback(test["test_name"], test["topic_name"], test["questions"], answers, recommendation_pool)
     return jsonify({"success": True, "score": score, "correct": correct_count, "total": len(test["questions"]), "attempt_id": attempt_id, "test_name": test["test_name"], "topic_name": test["topic_name"], "topic_key": test["topic_key"], "performance_feedback": performance_feedback})
@@ -283,7 +271,7 @@ def api_topic_test_solutions(test_id):
     if "user_id" not in session:
         return jsonify({"success": False, "message": "Not logged in"}), 401
 
-    test = TOPIC_TEST_MAP.get(test_id)
+    test = get_topic_test(test_id)
     if not test:
         return jsonify({"success": False, "message": "Test not found"}), 404
 
@@ -303,7 +291,7 @@ def api_topic_test_solutions(test_id):
         "questions": [
             {
                 "question_text": question["question_text"],
-                "options": question["options"],
+                "options": dict(question["options"]),
                 "correct_answer": question["correct_answer"],
                 "selected_answer": response_map.get(question["question_key"], {}).get("selected_answer", ""),
                 "is_correct": bool(response_map.get(question["question_key"], {}).get("is_correct", 0)),
@@ -339,7 +327,7 @@ def api_submit_test():
     correct_count = 0
     total_points = 0
     earned_points = 0
-    attempt_id = create_test_attempt(session["user_id"], section_id, len(questions), time_taken, current_time())
+    responses = []
 
     for question in questions:
         selected_answer = answers.get(str(question["id"]), "")
@@ -348,11 +336,11 @@ def api_submit_test():
         if is_correct:
             correct_count += 1
             earned_points += question["points"]
-        create_user_response(attempt_id, question["id"], selected_answer, is_correct)
+        responses.append((question["id"], selected_answer, is_correct))
 
     score = (earned_points / total_points * 100) if total_points > 0 else 0
-    finalize_test_attempt(attempt_id, score, correct_count)
-    _generate_ai_recommendations(session["user_id"])
+    attempt_id = record_test_attempt(session["user_id"], section_id, time_taken, current_time(), responses, score, correct_count)
+    schedule_recommendation_refresh(session["user_id"], _generate_ai_recommendations)
     return jsonify({"success": True, "score": round(score, 2), "correct": correct_count, "total": len(questions), "attempt_id": attempt_id})
 
 
@@ -360,7 +348,11 @@ def api_submit_test():
 def api_company_tests():
     if "user_id" not in session:
         return jsonify({"success": False, "message": "Not logged in"}), 401
-    return jsonify([dict(row) for row in get_company_tests_for_user(session["user_id"])])
+    return _list_response(
+        lambda after, limit: get_company_tests_for_user(session["user_id"], after, limit),
+        lambda after: iter_company_tests_for_user(session["user_id"], after),
+        ("company_name", "test_name"),
+    )
 
 
 @routes_bp.route("/api/company_tests/<int:company_test_id>/questions", methods=["GET"])
@@ -390,7 +382,7 @@ def api_submit_company_test(company_test_id):
     if "user_id" not in session:
         return jsonify({"success": False, "message": "Not logged in"}), 401
 
-    questions = db_get_company_test_questions(company_test_id, include_answers=True)
+    questions = [dict(row) for row in db_get_company_test_questions(company_test_id, include_answers=True)]
     test = get_company_test(company_test_id)
     if not questions or not test:
         return jsonify({"success": False, "message": "Questions not available for this company test yet."}), 404
@@ -399,18 +391,18 @@ def api_submit_company_test(company_test_id):
     answers = data.get("answers", {})
     time_taken = data.get("time_taken", 0)
     correct_count = 0
-    attempt_id = create_company_test_attempt(session["user_id"], company_test_id, time_taken, current_time())
+    responses = []
 
     for question in questions:
         selected_answer = (answers.get(str(question["id"])) or "").upper()
         is_correct = selected_answer == (question["correct_answer"] or "").upper()
         if is_correct:
             correct_count += 1
-        create_company_test_response(attempt_id, question["id"], selected_answer, is_correct)
+        responses.append((question["id"], selected_answer, is_correct))
 
     score = round((correct_count / len(questions)) * 100, 2) if questions else 0
-    finalize_company_test_attempt(attempt_id, score)
-    _generate_ai_recommendations(session["user_id"])
+    attempt_id = record_company_test_attempt(session["user_id"], company_test_id, time_taken, current_time(), responses, score, correct_count)
+    schedule_recommendation_refresh(session["user_id"], _generate_ai_recommendations)
     recommendation_pool = sorted({row["section"] for row in questions if row["section"]})
     performance_feedback = build_test_performance_feedback(test["test_name"], test["company_name"], questions, answers, recommendation_pool)
     return jsonify({"success": True, "score": score, "correct": correct_count, "total": len(questions), "attempt_id": attempt_id, "performance_feedback": performance_feedback})
@@ -456,7 +448,11 @@ def api_company_test_solutions(company_test_id):
 def api_user_scores():
     if "user_id" not in session:
         return jsonify({"success": False, "message": "Not logged in"}), 401
-    return jsonify([dict(row) for row in get_user_scores(session["user_id"])])
+    return _list_response(
+        lambda after, limit: get_user_scores(session["user_id"], after, limit),
+        lambda after: iter_user_scores(session["user_id"], after),
+        ("completed_at", "attempt_kind", "attempt_id"),
+    )
 
 
 @routes_bp.route("/api/section_performance", methods=["GET"])
@@ -635,6 +631,7 @@ def api_ai_recommendations():
     if "user_id" not in session:
         return jsonify({"success": False, "message": "Not logged in"}), 401
 
+    wait_for_recommendation_refresh(session["user_id"])
     recommendations = get_latest_ai_recommendation(session["user_id"])
     if not recommendations:
         _generate_ai_recommendations(session["user_id"])
@@ -646,7 +643,7 @@ def api_ai_recommendations():
 def api_admin_students():
     if "user_id" not in session or session.get("role") != "admin":
         return jsonify({"success": False, "message": "Unauthorized"}), 403
-    return jsonify([dict(row) for row in get_admin_students()])
+    return _list_response(get_admin_students, iter_admin_students, ("id",))
 
 
 @routes_bp.route("/api/admin/department_stats", methods=["GET"])
@@ -656,15 +653,120 @@ def api_admin_department_stats():
     return jsonify([dict(row) for row in get_admin_department_stats()])
 
 
+@routes_bp.route("/api/admin/metrics/db", methods=["GET"])
+def api_admin_db_metrics():
+    if "user_id" not in session or session.get("role") != "admin":
+        return jsonify({"success": False, "message": "Unauthorized"}), 403
+    limit = max(1, min(request.args.get("limit", 25, type=int), MAX_PAGE_SIZE))
+    return jsonify({"success": True, **get_query_metrics(limit), "topic_bank": get_topic_bank_cache_stats()})
+
+
 @routes_bp.route("/api/admin/reset_demo_data", methods=["POST"])
 def api_admin_reset_demo_data():
     if "user_id" not in session or session.get("role") != "admin":
         return jsonify({"success": False, "message": "Unauthorized"}), 403
     try:
-        deleted_rows = reset_demo_data()
+        job = start_demo_data_purge(current_app.config["PURGE_CHUNK_SIZE"])
     except sqlite3.DatabaseError as error:
         return jsonify({"success": False, "message": f"Database reset failed: {error}"}), 500
-    return jsonify({"success": True, "message": "Demo data cleared successfully", "deleted_rows": deleted_rows})
+    return jsonify({"success": True, "message": "Demo data purge started", "job": job, "status_url": url_for("routes.api_admin_reset_demo_data_status", job_id=job["id"])}), 202
+
+
+@routes_bp.route("/api/admin/reset_demo_data/status", methods=["GET"])
+def api_admin_reset_demo_data_status():
+    if "user_id" not in session or session.get("role") != "admin":
+        return jsonify({"success": False, "message": "Unauthorized"}), 403
+    job = get_maintenance_job(request.args.get("job_id", type=int), "demo_data_purge")
+    if not job or job["job_type"] != "demo_data_purge":
+        return jsonify({"success": False, "message": "No demo data purge found"}), 404
+    return jsonify({"success": True, "job": job})
+
+
+@routes_bp.route("/api/admin/regrade", methods=["POST"])
+def api_admin_regrade():
+    if "user_id" not in session or session.get("role") != "admin":
+        return jsonify({"success": False, "message": "Unauthorized"}), 403
+    data = request.get_json() or {}
+    try:
+        job = start_answer_key_regrade(data.get("kind"), data.get("question_id"), data.get("correct_answer"), current_app.config["REGRADE_CHUNK_SIZE"])
+    except ValueError as error:
+        return jsonify({"success": False, "message": str(error)}), 400
+    except MaintenanceJobConflict as conflict:
+        return jsonify({"success": False, "message": "Another regrade is still running; retry once it finishes.", "job": conflict.job}), 409
+    except sqlite3.DatabaseError as error:
+        return jsonify({"success": False, "message": f"Regrade failed: {error}"}), 500
+    if job is None:
+        return jsonify({"success": False, "message": "Question not found"}), 404
+    return jsonify({"success": True, "message": "Regrade started", "job": job, "status_url": url_for("routes.api_admin_regrade_status", job_id=job["id"])}), 202
+
+
+@routes_bp.route("/api/admin/regrade/status", methods=["GET"])
+def api_admin_regrade_status():
+    if "user_id" not in session or session.get("role") != "admin":
+        return jsonify({"success": False, "message": "Unauthorized"}), 403
+    job = get_maintenance_job(request.args.get("job_id", type=int), "answer_key_regrade")
+    if not job or job["job_type"] != "answer_key_regrade":
+        return jsonify({"success": False, "message": "No regrade job found"}), 404
+    return jsonify({"success": True, "job": job})
+
+
+@routes_bp.route("/api/admin/recommendations/recompute", methods=["POST"])
+def api_admin_recompute_recommendations():
+    if "user_id" not in session or session.get("role") != "admin":
+        return jsonify({"success": False, "message": "Unauthorized"}), 403
+    try:
+        job = start_recommendation_recompute(
+            build_ai_recommendation_payload,
+            current_app.config["RECOMMENDATION_RECOMPUTE_CHUNK_SIZE"],
+            current_app.config["RECOMMENDATION_RECOMPUTE_WORKERS"],
+        )
+    except sqlite3.DatabaseError as error:
+        return jsonify({"success": False, "message": f"Recommendation recompute failed: {error}"}), 500
+    return jsonify({"success": True, "message": "Recommendation recompute started", "job": job, "status_url": url_for("routes.api_admin_recompute_recommendations_status", job_id=job["id"])}), 202
+
+
+@routes_bp.route("/api/admin/recommendations/recompute/status", methods=["GET"])
+def api_admin_recompute_recommendations_status():
+    if "user_id" not in session or session.get("role") != "admin":
+        return jsonify({"success": False, "message": "Unauthorized"}), 403
+    job = get_maintenance_job(request.args.get("job_id", type=int), "recommendation_recompute")
+    if not job or job["job_type"] != "recommendation_recompute":
+        return jsonify({"success": False, "message": "No recommendation recompute found"}), 404
+    return jsonify({"success": True, "job": job})
+
+
+@routes_bp.route("/api/admin/recommendations/compact", methods=["POST"])
+def api_admin_compact_recommendations():
+    if "user_id" not in session or session.get("role") != "admin":
+        return jsonify({"success": False, "message": "Unauthorized"}), 403
+    try:
+        job = start_ai_recommendation_compaction(current_app.config["AI_RECOMMENDATION_COMPACT_CHUNK_SIZE"])
+    except sqlite3.DatabaseError as error:
+        return jsonify({"success": False, "message": f"Recommendation compaction failed: {error}"}), 500
+    return jsonify({"success": True, "message": "Recommendation compaction started", "job": job, "status_url": url_for("routes.api_admin_compact_recommendations_status", job_id=job["id"])}), 202
+
+
+@routes_bp.route("/api/admin/recommendations/compact/status", methods=["GET"])
+def api_admin_compact_recommendations_status():
+    if "user_id" not in session or session.get("role") != "admin":
+        return jsonify({"success": False, "message": "Unauthorized"}), 403
+    job = get_maintenance_job(request.args.get("job_id", type=int), "ai_recommendation_compaction")
+    if not job or job["job_type"] != "ai_recommendation_compaction":
+        return jsonify({"success": False, "message": "No recommendation compaction found"}), 404
+    return jsonify({"success": True, "job": job})
+
+
+@routes_bp.route("/api/admin/backups", methods=["GET", "POST"])
+def api_admin_backups():
+    if "user_id" not in session or session.get("role") != "admin":
+        return jsonify({"success": False, "message": "Unauthorized"}), 403
+    if request.method == "POST":
+        try:
+            job = start_database_backup()
+        except sqlite3.DatabaseError as error:
+            return jsonify({"success": False, "message": f"Database backup failed: {error}"}), 500
+        return jsonify({"success": True, "message": "Database backup started", "job": job}), 202
+    return jsonify({"success": True, "snapshots": list_database_snapshots(), "job": get_maintenance_job(job_type="database_backup")})
 
 
 @routes_bp.route("/api/user_info", methods=["GET"])
@@ -674,9 +776,49 @@ def api_user_info():
     return jsonify({"user_id": session["user_id"], "username": session["username"], "full_name": session["full_name"], "role": session["role"]})
 
 
+def _list_response(fetch_page, iter_rows, cursor_fields):
+    limit = request.args.get("limit", type=int)
+    cursor = request.args.get("cursor")
+    stream_format = request.args.get("stream")
+    try:
+        after = decode_cursor(cursor, len(cursor_fields)) if cursor else None
+    except ValueError as error:
+        return jsonify({"success": False, "message": str(error)}), 400
+
+    if stream_format in {"ndjson", "json"}:
+        return _stream_rows(iter_rows(after), stream_format)
+    if limit is None and after is None:
+        return jsonify([dict(row) for row in fetch_page(None, None)])
+
+    if limit is None:
+        limit = MAX_PAGE_SIZE
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    rows = fetch_page(after, limit + 1)
+    items = [dict(row) for row in rows[:limit]]
+    next_cursor = encode_cursor(items[-1][field] for field in cursor_fields) if len(rows) > limit else None
+    return jsonify({"items": items, "next_cursor": next_cursor})
+
+
+def _stream_rows(rows, stream_format):
+    dumps = current_app.json.dumps
+
+    def generate_ndjson():
+        for row in rows:
+            yield dumps(dict(row)) + "\n"
+
+    def generate_json_array():
+        yield "["
+        for index, row in enumerate(rows):
+            yield ("," if index else "") + dumps(dict(row))
+        yield "]"
+
+    if stream_format == "ndjson":
+        return Response(stream_with_context(generate_ndjson()), mimetype="application/x-ndjson")
+    return Response(stream_with_context(generate_json_array()), mimetype="application/json")
+
+
 def _generate_ai_recommendations(user_id):
-    performance = get_recommendation_performance(user_id)
-    payload = build_ai_recommendation_payload(performance)
+    payload = build_ai_recommendation_payload(get_recommendation_stats(user_id))
     save_ai_recommendation(
         user_id,
         json.dumps(payload["weak_sections"]),
@@ -0,0 +1,85 @@
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+os.environ.setdefault("PLACIFY_DATA_DIR", tempfile.mkdtemp(prefix="placify-tests-"))
+os.environ["BACKUP_INTERVAL_MINUTES"] = "0"
+os.environ["RECOMMENDATION_EXECUTOR_ENABLED"] = "0"
+
+import db  # noqa: E402
+import utils  # noqa: E402
+from app import app as placify_app  # noqa: E402
+
+
+@pytest.fixture
+def app(tmp_path):
+    original_config = dict(placify_app.config)
+    placify_app.config.update(TESTING=True, DATABASE_PATH=str(tmp_path / "placify.db"), _DB_INITIALIZED=False)
+    utils.RENDERED_TOPIC_QUESTIONS.clear()
+    db.COMPANY_CATALOG_CACHE.clear()
+    yield placify_app
+    placify_app.config.clear()
+    placify_app.config.update(original_config)
+
+
+@pytest.fixture
+def admin_client(app):
+    client = app.test_client()
+    client.post("/api/login", json={"username": "admin", "password": "admin123"})
+    return client
+
+
+@pytest.fixture
+def make_student(app):
+    def make(username):
+        client = app.test_client()
+        client.post(
+            "/api/register",
+            json={"username": username, "email": f"{username}@example.com", "password": "secret", "full_name": username.title(), "department": "CS", "year": 3},
+        )
+        response = client.post("/api/login", json={"username": username, "password": "secret"})
+        assert response.status_code == 200, response.get_json()
+        return client
+
+    return make
+
+
+@pytest.fixture
+def submit_all(app):
+    def submit(client, choose, topic_test="aptitude-test-1", company_test=1, section=1):
+        questions = client.get(f"/api/questions/{section}").get_json()
+        client.post("/api/submit_test", json={"section_id": section, "answers": {str(question["id"]): choose(question["id"]) for question in questions}})
+        topic_questions = client.get(f"/api/topic_tests/{topic_test}/questions").get_json()["questions"]
+        client.post(f"/api/topic_tests/{topic_test}/submit", json={"answers": {question["question_id"]: choose(question["question_id"]) for question in topic_questions}})
+        company_questions = client.get(f"/api/company_tests/{company_test}/questions").get_json()["questions"]
+        client.post(f"/api/company_tests/{company_test}/submit", json={"answers": {str(question["id"]): choose(question["id"]) for question in company_questions}})
+
+    return submit
+
+
+@pytest.fixture
+def wait_for_job():
+    def wait(client, status_url, timeout=10):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            job = client.get(status_url).get_json()["job"]
+            if job["status"] in ("completed", "failed"):
+                return job
+            time.sleep(0.02)
+        raise AssertionError(f"{status_url} did not finish within {timeout}s")
+
+    return wait
+
+
+@pytest.fixture
+def user_id(app):
+    def lookup(username):
+        with app.app_context():
+            return db._fetch_one("SELECT id FROM users WHERE username = ?", (username,))["id"]
+
+    return lookup
@@ -0,0 +1,65 @@
+import random
+
+import db
+
+RESPONSE_TABLES = {
+    "test_attempts": "user_responses",
+    "topic_test_attempts": "topic_test_responses",
+    "company_test_attempts": "company_test_responses",
+}
+
+
+def test_demo_data_purge_keeps_protected_users(app, admin_client, make_student, submit_all, wait_for_job, user_id):
+    rng = random.Random(2)
+    student1 = app.test_client()
+    student1.post("/api/login", json={"username": "student1", "password": "student123"})
+    submit_all(student1, lambda _key: rng.choice("ABCD"))
+    for username, storage_mode in (("jay", "rows"), ("kiran", "packed")):
+        app.config["RESPONSE_STORAGE_MODE"] = storage_mode
+        client = make_student(username)
+        submit_all(client, lambda _key: rng.choice("ABCD"))
+        client.get("/api/ai_recommendations")
+
+    app.config["PURGE_CHUNK_SIZE"] = 1
+    response = admin_client.post("/api/admin/reset_demo_data")
+    assert response.status_code == 202
+    job = wait_for_job(admin_client, response.get_json()["status_url"])
+    assert job["status"] == "completed", job["error"]
+
+    protected_id = user_id("student1")
+    with app.app_context():
+        for attempt_table, response_table in RESPONSE_TABLES.items():
+            owners = {row["user_id"] for row in db._fetch_all(f"SELECT user_id FROM {attempt_table}")}
+            assert owners == {protected_id}
+            assert db._fetch_one(f"SELECT COUNT(*) FROM {response_table} WHERE attempt_id NOT IN (SELECT id FROM {attempt_table})")[0] == 0
+        for table_name in db.DEMO_DATA_PURGE_STEPS:
+            assert db._fetch_one(f"SELECT COUNT(*) FROM {table_name} WHERE user_id NOT IN (?, ?)", (protected_id, user_id("admin")))[0] == 0
+        assert db.get_db().execute("PRAGMA foreign_key_check").fetchall() == []
+
+
+def test_demo_data_purge_survives_submissions_between_chunks(app, make_student, submit_all, user_id, monkeypatch):
+    for username in ("lena", "milo"):
+        submit_all(make_student(username), lambda _key: "B")
+    lena_id = user_id("lena")
+    set_progress = db._set_maintenance_job_progress
+    submitted = []
+
+    def submit_between_chunks(connection, job_id, progress):
+        if not submitted and progress["current_table"] not in ("user_responses", "test_attempts"):
+            attempt_id = connection.execute(
+                "INSERT INTO test_attempts (user_id, section_id, score, total_questions, correct_answers, time_taken) VALUES (?, 1, 100, 1, 1, 5)",
+                (lena_id,),
+            ).lastrowid
+            connection.execute("INSERT INTO user_responses (attempt_id, question_id, selected_answer, is_correct) VALUES (?, 1, 'B', 1)", (attempt_id,))
+            submitted.append(attempt_id)
+        set_progress(connection, job_id, progress)
+
+    monkeypatch.setattr(db, "_set_maintenance_job_progress", submit_between_chunks)
+    with app.app_context():
+        connection = db.get_db()
+        job_id = connection.execute("INSERT INTO maintenance_jobs (job_type, status) VALUES ('demo_data_purge', 'running')").lastrowid
+        connection.commit()
+        result = db._purge_demo_data(job_id, 2)
+        assert result["deleted_rows"]["test_attempts"] >= 1
+        assert connection.execute("PRAGMA foreign_key_check").fetchall() == []
+        assert db._fetch_one("SELECT COUNT(*) FROM user_responses WHERE attempt_id NOT IN (SELECT id FROM test_attempts)")[0] == 0
@@ -0,0 +1,73 @@
+import json
+import random
+
+import db
+from data.test_catalog import build_topic_test_catalog
+from utils import build_ai_recommendation_payload
+
+
+def rebuilt_stats(user_id):
+    return db.summarize_recommendation_rows(db.get_recommendation_performance(user_id))
+
+
+def test_packed_and_row_storage_decode_identically(app, make_student, submit_all, user_id):
+    rng = random.Random(11)
+    answers = {}
+
+    def choose(key):
+        return answers.setdefault(key, rng.choice("ABCD"))
+
+    for username, storage_mode in (("rowan", "rows"), ("paige", "packed")):
+        app.config["RESPONSE_STORAGE_MODE"] = storage_mode
+        client = make_student(username)
+        submit_all(client, choose)
+        client.get("/api/ai_recommendations")
+
+    with app.app_context():
+        attempts = {}
+        for username in ("rowan", "paige"):
+            uid = user_id(username)
+            topic_attempt = db._fetch_one("SELECT id, packed_responses FROM topic_test_attempts WHERE user_id = ?", (uid,))
+            company_attempt = db._fetch_one("SELECT id, packed_responses FROM company_test_attempts WHERE user_id = ?", (uid,))
+            attempts[username] = (topic_attempt, company_attempt)
+
+        assert attempts["rowan"][0]["packed_responses"] is None
+        assert attempts["paige"][0]["packed_responses"] is not None
+
+        def decoded(username):
+            topic_attempt, company_attempt = attempts[username]
+            return (
+                sorted((row["question_key"], row["selected_answer"], int(row["is_correct"])) for row in db.get_topic_responses(topic_attempt["id"])),
+                sorted((row["question_id"], row["selected_answer"], int(row["is_correct"])) for row in db.get_company_test_responses(company_attempt["id"])),
+            )
+
+        assert decoded("rowan") == decoded("paige")
+
+        payloads = []
+        for username in ("rowan", "paige"):
+            uid = user_id(username)
+            stats = db.get_recommendation_stats(uid)
+            assert stats == rebuilt_stats(uid)
+            assert build_ai_recommendation_payload(stats) == build_ai_recommendation_payload(rebuilt_stats(uid))
+            payloads.append(json.loads(db.get_latest_ai_recommendation(uid)["recommendation_payload"]))
+        assert payloads[0] == payloads[1]
+
+
+def test_reordering_a_topic_test_keeps_packed_answers_with_their_questions(app, make_student):
+    app.config["RESPONSE_STORAGE_MODE"] = "packed"
+    client = make_student("quinn")
+    questions = client.get("/api/topic_tests/aptitude-test-1/questions").get_json()["questions"]
+    answers = {question["question_id"]: "ABCD"[index % 4] for index, question in enumerate(questions)}
+    attempt_id = client.post("/api/topic_tests/aptitude-test-1/submit", json={"answers": answers}).get_json()["attempt_id"]
+
+    with app.app_context():
+        before = sorted((row["question_key"], row["selected_answer"], int(row["is_correct"])) for row in db.get_topic_responses(attempt_id))
+        catalog = build_topic_test_catalog()
+        test = next(test for topic in catalog for test in topic["tests"] if test["test_id"] == "aptitude-test-1")
+        test["questions"].reverse()
+        with db._write_transaction() as connection:
+            assert db.sync_topic_bank(connection, catalog)
+
+        assert db._fetch_one("SELECT packed_responses FROM topic_test_attempts WHERE id = ?", (attempt_id,))["packed_responses"] is None
+        after = sorted((row["question_key"], row["selected_answer"], int(row["is_correct"])) for row in db.get_topic_responses(attempt_id))
+        assert after == before
@@ -0,0 +1,34 @@
+import base64
+import json
+
+import pytest
+
+from utils import decode_cursor, encode_cursor
+
+
+def raw_cursor(values):
+    return base64.urlsafe_b64encode(json.dumps(values).encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def test_cursor_round_trips_scalars():
+    assert decode_cursor(encode_cursor(["Amazon", 3, 1.5, None]), 4) == ("Amazon", 3, 1.5, None)
+
+
+@pytest.mark.parametrize("values", [[[1]], [{"id": 1}], [True], ["a", "b"]])
+def test_cursor_rejects_non_scalar_or_wrong_length_values(values):
+    with pytest.raises(ValueError, match="Invalid cursor"):
+        decode_cursor(raw_cursor(values), 1)
+
+
+def test_admin_students_rejects_nested_cursor(admin_client):
+    response = admin_client.get(f"/api/admin/students?cursor={raw_cursor([[1]])}&limit=5")
+    assert response.status_code == 400
+    assert response.get_json()["message"] == "Invalid cursor"
+
+
+def test_zero_limit_is_not_a_full_page(admin_client, make_student):
+    for index in range(3):
+        make_student(f"pager{index}")
+    page = admin_client.get("/api/admin/students?limit=0").get_json()
+    assert len(page["items"]) == 1
+    assert page["next_cursor"] is not None
@@ -0,0 +1,12 @@
+import db
+
+
+def test_slow_query_log_keeps_parameters_out(app, admin_client, caplog):
+    app.config["SQLITE_SLOW_QUERY_MS"] = 0.000001
+    db.SLOW_QUERY_LOG.clear()
+    app.test_client().post("/api/login", json={"username": "zed", "password": "hunter2-secret"})
+
+    body = admin_client.get("/api/admin/metrics/db?limit=500").get_data(as_text=True)
+    assert "hunter2-secret" not in body
+    assert "hunter2-secret" not in caplog.text
+    assert any("password = ?" in entry["statement"] for entry in db.SLOW_QUERY_LOG)
@@ -0,0 +1,44 @@
+import json
+import zlib
+
+import db
+
+
+def insert_history(connection, user_id, count):
+    payloads = [json.dumps({"version": index}) for index in range(count)]
+    connection.executemany(
+        "INSERT INTO ai_recommendations (user_id, weak_sections, improvement_areas, practice_focus, readiness_score, recommendation_payload) VALUES (?, '[]', '[]', 'Practice', 50, ?)",
+        [(user_id, payload) for payload in payloads],
+    )
+    connection.execute("DELETE FROM ai_recommendation_latest WHERE user_id = ?", (user_id,))
+    connection.commit()
+    return payloads
+
+
+def test_compaction_trims_compresses_and_restores_latest(app, user_id):
+    app.config["AI_RECOMMENDATION_HISTORY_LIMIT"] = 5
+    student_id = user_id("student1")
+    with app.app_context():
+        payloads = insert_history(db.get_db(), student_id, 30)
+        progress = db.compact_ai_recommendation_history(chunk_size=1)
+        assert progress["rows_deleted"] == 25
+        assert progress["latest_restored"] == 1
+
+        history = db._fetch_all("SELECT id, recommendation_payload, payload_zlib FROM ai_recommendations WHERE user_id = ? ORDER BY id", (student_id,))
+        assert len(history) == 5
+        assert all(row["recommendation_payload"] is None for row in history)
+        assert [zlib.decompress(row["payload_zlib"]).decode("utf-8") for row in history] == payloads[-5:]
+
+        latest = db.get_latest_ai_recommendation(student_id)
+        assert latest["id"] == history[-1]["id"]
+        assert latest["recommendation_payload"] == payloads[-1]
+
+
+def test_compaction_rejects_empty_chunks(app, user_id):
+    with app.app_context():
+        insert_history(db.get_db(), user_id("student1"), 3)
+        assert db.compact_ai_recommendation_history(chunk_size=0)["users_scanned"] == 0
+
+    result = app.test_cli_runner().invoke(args=["compact-recommendations", "--chunk-size", "0"])
+    assert result.exit_code != 0
+    assert "chunk-size" in result.output
@@ -0,0 +1,66 @@
+import json
+import random
+import sqlite3
+
+import db
+from utils import build_ai_recommendation_payload
+
+
+def rebuilt_stats(user_id):
+    return db.summarize_recommendation_rows(db.get_recommendation_performance(user_id))
+
+
+def test_recompute_only_writes_students(app, make_student, submit_all, user_id):
+    rng = random.Random(3)
+    for username in ("dev", "esha"):
+        submit_all(make_student(username), lambda _key: rng.choice("ABCD"))
+
+    with app.app_context():
+        progress = db.recompute_all_recommendations(build_ai_recommendation_payload, chunk_size=1, workers=1)
+        assert progress["users_total"] == progress["users_processed"] == 3
+        assert db.get_latest_ai_recommendation(user_id("admin")) is None
+        for username in ("student1", "dev", "esha"):
+            uid = user_id(username)
+            latest = json.loads(db.get_latest_ai_recommendation(uid)["recommendation_payload"])
+            assert latest == build_ai_recommendation_payload(rebuilt_stats(uid))
+
+        assert db.recompute_all_recommendations(build_ai_recommendation_payload, chunk_size=2, workers=1)["users_changed"] == 0
+
+
+def test_recompute_releases_the_write_lock_while_computing(app, make_student, submit_all, user_id):
+    submit_all(make_student("farah"), lambda _key: "A")
+    farah_id = user_id("farah")
+    with app.app_context():
+        latest_id = db.get_latest_ai_recommendation(farah_id)["id"]
+    database_path = app.config["DATABASE_PATH"]
+    submissions = []
+
+    def builder_that_writes(stats):
+        if stats["attempt_count"] and not submissions:
+            submissions.append(farah_id)
+            with sqlite3.connect(database_path, timeout=0.2) as connection:
+                connection.execute(
+                    "INSERT INTO topic_test_attempts (user_id, test_key, topic_name, test_name, score, total_questions, correct_answers, time_taken) VALUES (?, 'aptitude-test-3', 'Aptitude', 'Aptitude Test 3', 0, 0, 0, 1)",
+                    (farah_id,),
+                )
+        return build_ai_recommendation_payload(stats)
+
+    with app.app_context():
+        progress = db.recompute_all_recommendations(builder_that_writes, chunk_size=500, workers=1)
+    assert progress["users_skipped"] == 1
+    with app.app_context():
+        assert db.get_latest_ai_recommendation(farah_id)["id"] == latest_id
+
+
+def test_recompute_on_spawned_workers(app, make_student, submit_all, user_id):
+    rng = random.Random(5)
+    for username in ("gita", "hamid", "ines"):
+        submit_all(make_student(username), lambda _key: rng.choice("ABCD"))
+
+    with app.app_context():
+        progress = db.recompute_all_recommendations(build_ai_recommendation_payload, chunk_size=2, workers=2)
+        assert progress["workers"] == 2
+        assert progress["users_processed"] == 4
+        for username in ("gita", "hamid", "ines"):
+            uid = user_id(username)
+            assert db.get_recommendation_stats(uid) == rebuilt_stats(uid)
@@ -0,0 +1,33 @@
+import random
+
+import pytest
+
+import db
+
+
+def rebuilt_stats(user_id):
+    return db.summarize_recommendation_rows(db.get_recommendation_performance(user_id))
+
+
+@pytest.mark.parametrize("storage_mode", ["rows", "packed"])
+def test_incremental_counters_match_full_rebuild(app, make_student, submit_all, user_id, storage_mode):
+    app.config["RESPONSE_STORAGE_MODE"] = storage_mode
+    rng = random.Random(7)
+    usernames = ["asha", "bilal", "chen"]
+    for username in usernames:
+        client = make_student(username)
+        submit_all(client, lambda _key: rng.choice("ABCD"))
+        client.get("/api/ai_recommendations")
+        submit_all(client, lambda _key: rng.choice("ABCD"), topic_test="aptitude-test-2", company_test=2, section=2)
+        submit_all(client, lambda _key: rng.choice("ABCD"), topic_test="aptitude-test-3")
+
+    with app.app_context():
+        for username in usernames:
+            uid = user_id(username)
+            assert db._has_recommendation_stats(db.get_db(), uid)
+            assert db.get_recommendation_stats(uid) == rebuilt_stats(uid)
+
+        db.rebuild_summary_tables()
+        for username in usernames:
+            uid = user_id(username)
+            assert db.get_recommendation_stats(uid) == rebuilt_stats(uid)
@@ -0,0 +1,110 @@
+import random
+
+import pytest
+
+import db
+
+ATTEMPT_TABLES = {"test": "test_attempts", "topic": "topic_test_attempts", "company": "company_test_attempts"}
+
+
+def question_ids(client, kind, owner):
+    if kind == "test":
+        return [question["id"] for question in client.get(f"/api/questions/{owner}").get_json()]
+    if kind == "topic":
+        return [question["question_id"] for question in client.get(f"/api/topic_tests/{owner}/questions").get_json()["questions"]]
+    return [question["id"] for question in client.get(f"/api/company_tests/{owner}/questions").get_json()["questions"]]
+
+
+def submit(client, kind, owner, answers):
+    if kind == "test":
+        response = client.post("/api/submit_test", json={"section_id": owner, "answers": {str(key): value for key, value in answers.items()}})
+    elif kind == "topic":
+        response = client.post(f"/api/topic_tests/{owner}/submit", json={"answers": answers})
+    else:
+        response = client.post(f"/api/company_tests/{owner}/submit", json={"answers": {str(key): value for key, value in answers.items()}})
+    assert response.status_code == 200, response.get_json()
+    return response.get_json()
+
+
+def regrade_target(app, kind):
+    with app.app_context():
+        if kind == "test":
+            question = db._fetch_one("SELECT id, section_id AS owner, correct_answer FROM questions WHERE section_id = 1 ORDER BY id LIMIT 1 OFFSET 2")
+            return question["id"], question["correct_answer"], [question["owner"]], question["id"]
+        if kind == "company":
+            question = db._fetch_one("SELECT id, company_test_id AS owner, correct_answer FROM company_test_questions WHERE company_test_id = 1 ORDER BY id LIMIT 1 OFFSET 1")
+            return question["id"], question["correct_answer"], [question["owner"]], question["id"]
+        shared = db._fetch_one("SELECT question_key FROM topic_bank_questions GROUP BY question_key HAVING COUNT(*) > 1 ORDER BY question_key LIMIT 1")["question_key"]
+        rows = db._fetch_all(
+            "SELECT q.question_id, q.correct_answer, t.test_key FROM topic_bank_questions q JOIN topic_bank_tests t ON t.id = q.test_id WHERE q.question_key = ? ORDER BY t.id",
+            (shared,),
+        )
+        return rows[0]["question_id"], rows[0]["correct_answer"], [row["test_key"] for row in rows], {row["test_key"]: row["question_id"] for row in rows}
+
+
+def summary_snapshot():
+    return {
+        table_name: sorted(tuple(row) for row in db._fetch_all(f"SELECT * FROM {table_name}"))
+        for table_name in ("user_section_stats", "student_summaries", "department_summaries")
+    }
+
+
+@pytest.mark.parametrize("storage_mode", ["rows", "packed"])
+@pytest.mark.parametrize("kind", ["test", "topic", "company"])
+def test_regrade_matches_resubmission(app, admin_client, make_student, wait_for_job, monkeypatch, kind, storage_mode):
+    app.config["RESPONSE_STORAGE_MODE"] = storage_mode
+    monkeypatch.setattr(db, "SUMMARY_REBUILD_CHUNK_SIZE", 2)
+    question_id, old_answer, owners, regraded_ids = regrade_target(app, kind)
+    new_answer = next(letter for letter in "ABCD" if letter != old_answer)
+    rng = random.Random(f"{kind}-{storage_mode}")
+
+    submissions = []
+    for index in range(3):
+        client = make_student(f"{kind}{storage_mode}{index}")
+        for owner in owners:
+            regraded_id = regraded_ids[owner] if kind == "topic" else regraded_ids
+            answers = {key: rng.choice("ABCD") for key in question_ids(client, kind, owner)}
+            if index == 0:
+                answers[regraded_id] = new_answer
+            submissions.append((owner, answers, submit(client, kind, owner, answers)["attempt_id"]))
+
+    response = admin_client.post("/api/admin/regrade", json={"kind": kind, "question_id": question_id, "correct_answer": new_answer})
+    assert response.status_code == 202, response.get_json()
+    job = wait_for_job(admin_client, response.get_json()["status_url"])
+    assert job["status"] == "completed", job["error"]
+    assert job["progress"]["attempts_regraded"] >= 1
+
+    with app.app_context():
+        if kind == "topic":
+            shared_answers = db._fetch_all(
+                "SELECT DISTINCT correct_answer FROM topic_bank_questions WHERE question_key = (SELECT question_key FROM topic_bank_questions WHERE question_id = ?)",
+                (question_id,),
+            )
+            assert [row["correct_answer"] for row in shared_answers] == [new_answer]
+        summaries = summary_snapshot()
+        db.rebuild_summary_tables()
+        assert summary_snapshot() == summaries
+        regraded = {
+            row["id"]: row
+            for row in db._fetch_all(f"SELECT id, score, correct_answers FROM {ATTEMPT_TABLES[kind]}")
+        }
+
+    for index, (owner, answers, attempt_id) in enumerate(submissions):
+        resubmitted = submit(make_student(f"re{kind}{storage_mode}{index}"), kind, owner, answers)
+        assert regraded[attempt_id]["correct_answers"] == resubmitted["correct"]
+        assert regraded[attempt_id]["score"] == pytest.approx(resubmitted["score"])
+
+
+def test_concurrent_regrade_is_rejected_without_changing_the_key(app, admin_client):
+    with app.app_context():
+        connection = db.get_db()
+        connection.execute("INSERT INTO maintenance_jobs (job_type, status) VALUES ('answer_key_regrade', 'running')")
+        connection.commit()
+        before = db._fetch_one("SELECT correct_answer FROM questions WHERE id = 1")["correct_answer"]
+
+    new_answer = next(letter for letter in "ABCD" if letter != before)
+    response = admin_client.post("/api/admin/regrade", json={"kind": "test", "question_id": 1, "correct_answer": new_answer})
+    assert response.status_code == 409
+    assert response.get_json()["job"]["status"] == "running"
+    with app.app_context():
+        assert db._fetch_one("SELECT correct_answer FROM questions WHERE id = 1")["correct_answer"] == before
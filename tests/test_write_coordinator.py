@@ -0,0 +1,38 @@
+import threading
+import time
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+import pytest
+
+import db
+
+
+def test_timed_out_write_is_never_committed(app):
+    app.config["WRITE_COORDINATOR_TIMEOUT"] = 0.05
+    release_writer = threading.Event()
+    blocked = {}
+
+    def hold_writer(connection):
+        release_writer.wait(5)
+        return "held"
+
+    def insert_marker(connection):
+        connection.execute("INSERT INTO maintenance_jobs (job_type, status) VALUES ('timeout_marker', 'completed')")
+
+    def submit_blocking_write():
+        with app.app_context():
+            blocked["result"] = db._submit_write(hold_writer)
+
+    with app.app_context():
+        db.ensure_database_initialized()
+        writer = threading.Thread(target=submit_blocking_write)
+        writer.start()
+        time.sleep(0.02)
+        with pytest.raises(FutureTimeoutError):
+            db._submit_write(insert_marker)
+        release_writer.set()
+        writer.join(5)
+        time.sleep(0.05)
+
+        assert db._fetch_one("SELECT COUNT(*) FROM maintenance_jobs WHERE job_type = 'timeout_marker'")[0] == 0
+        assert blocked["result"] == "held"
@@ -1,3 +1,6 @@
+import base64
+import binascii
+import hashlib
 import json
 import math
 import os
@@ -12,7 +15,7 @@ from reportlab.lib.pagesizes import LETTER
 from reportlab.pdfgen import canvas
 from werkzeug.utils import secure_filename
 
-from data.test_catalog import TOPIC_TEST_CATALOG
+from data.test_catalog import infer_topic_category
 from nlp.resume_parser import ResumeParser
 
 
@@ -22,26 +25,87 @@ DEFAULT_JOB_DESCRIPTION = (
     "We are hiring a software developer with python, java, javascript, sql, git, "
     "react, flask, docker, machine learning, and problem solving skills."
 )
-TOPIC_TEST_MAP = {
-    test["test_id"]: test
-    for topic in TOPIC_TEST_CATALOG
-    for test in topic["tests"]
-}
-TOPIC_QUESTION_MAP = {
-    question["question_key"]: {
-        "topic_name": test["topic_name"],
-        "question_text": question["question_text"],
-        "difficulty": question.get("difficulty", "Medium"),
-    }
-    for test in TOPIC_TEST_MAP.values()
-    for question in test["questions"]
-}
+DIFFICULTY_ORDER = {"Easy": 0, "Medium": 1, "Hard": 2}
+MAX_RENDERED_TOPIC_QUESTIONS = 512
+RENDERED_TOPIC_QUESTIONS = {}
 
 
 def current_time():
     return datetime.now(ZoneInfo("Asia/Kolkata")).strftime("%Y-%m-%d %H:%M:%S")
 
 
+def encode_cursor(values):
+    return base64.urlsafe_b64encode(json.dumps(list(values), separators=(",", ":")).encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor, expected_length):
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (binascii.Error, UnicodeError, ValueError) as error:
+        raise ValueError("Invalid cursor") from error
+    if not isinstance(values, list) or len(values) != expected_length:
+        raise ValueError("Invalid cursor")
+    if any(isinstance(value, bool) or not isinstance(value, (str, int, float, type(None))) for value in values):
+        raise ValueError("Invalid cursor")
+    return tuple(values)
+
+
+def build_topic_test_listing(listing, attempt_map):
+    payload = []
+    for topic, tests in listing:
+        topic_tests = []
+        for test in tests:
+            attempt = attempt_map.get(test["test_id"])
+            topic_tests.append({
+                **test,
+                "attempted": bool(attempt),
+                "status": "Attempted" if attempt else "Not Attempted",
+                "score": attempt["score"] if attempt else None,
+                "completed_at": attempt["completed_at"] if attempt else None,
+                "solution_unlocked": bool(attempt),
+            })
+        payload.append({**topic, "tests": topic_tests})
+    return payload
+
+
+def topic_test_listing_etag(bank_version, user_id, attempt_count, latest_attempt_id):
+    return hashlib.sha256(f"{bank_version}:{user_id}:{attempt_count}:{latest_attempt_id}".encode("utf-8")).hexdigest()[:32]
+
+
+def render_topic_test_questions(test, bank_version):
+    cache_key = (test["test_id"], bank_version)
+    rendered = RENDERED_TOPIC_QUESTIONS.get(cache_key)
+    if rendered is not None:
+        return rendered
+
+    payload = {
+        "test_id": test["test_id"],
+        "test_name": test["test_name"],
+        "topic_name": test["topic_name"],
+        "topic_key": test["topic_key"],
+        "time_limit": test["time_limit"],
+        "questions": [
+            {
+                "question_id": question["question_id"],
+                "question_text": question["question_text"],
+                "option_a": question["options"]["A"],
+                "option_b": question["options"]["B"],
+                "option_c": question["options"]["C"],
+                "option_d": question["options"]["D"],
+                "difficulty": question.get("difficulty", "Medium"),
+            }
+            for question in test["questions"]
+        ],
+    }
+    body = (json.dumps(payload, separators=(",", ":"), sort_keys=True) + "\n").encode("utf-8")
+    rendered = (body, hashlib.sha256(f"{bank_version}:".encode("utf-8") + body).hexdigest()[:32])
+    if len(RENDERED_TOPIC_QUESTIONS) >= MAX_RENDERED_TOPIC_QUESTIONS:
+        RENDERED_TOPIC_QUESTIONS.clear()
+    RENDERED_TOPIC_QUESTIONS[cache_key] = rendered
+    return rendered
+
+
 def calculate_resume_score(resume_data, jd_match_percentage=0):
     ats_score = 0
     if resume_data.get("full_name"):
@@ -104,8 +168,8 @@ def calculate_resume_score(resume_data, jd_match_percentage=0):
     }
 
 
-def build_ai_recommendation_payload(performance_rows):
-    if not performance_rows:
+def build_ai_recommendation_payload(recommendation_stats):
+    if not recommendation_stats or not recommendation_stats["attempt_count"]:
         return {
             "weak_sections": [],
             "improvement_areas": [],
@@ -118,48 +182,10 @@ def build_ai_recommendation_payload(performance_rows):
             "latest_recommendations": [],
         }
 
-    attempt_scores = {}
-    topic_stats = {}
-    difficulty_stats = {}
-    category_stats = {}
-    incorrect_categories = {}
-
-    for row in performance_rows:
-        question_meta = TOPIC_QUESTION_MAP.get(row["category_name"], {})
-        topic_name = row["section_name"] or row["topic_name"] or question_meta.get("topic_name") or "General"
-        question_text = question_meta.get("question_text", "")
-        difficulty = row["difficulty"] or question_meta.get("difficulty") or "Medium"
-        attempt_key = (row["source_type"], row["topic_name"], row["test_name"], row["completed_at"])
-        attempt_scores[attempt_key] = row["score"] or 0
-
-        topic_bucket = topic_stats.setdefault(topic_name, {"correct": 0, "total": 0})
-        topic_bucket["total"] += 1
-        if row["is_correct"]:
-            topic_bucket["correct"] += 1
-
-        difficulty_bucket = difficulty_stats.setdefault(difficulty, {"correct": 0, "total": 0})
-        difficulty_bucket["total"] += 1
-        if row["is_correct"]:
-            difficulty_bucket["correct"] += 1
-
-        raw_category = row["category_name"] or ""
-        if row["source_type"] == "company" and raw_category in TOPIC_CATEGORY_PATTERNS:
-            category_name = raw_category
-        elif row["source_type"] == "company" and raw_category in {"Logical Reasoning", "Verbal Ability"}:
-            category_name = raw_category
-        else:
-            category_name = infer_topic_category(topic_name, question_text or raw_category)
-        category_bucket = category_stats.setdefault(category_name, {"correct": 0, "total": 0})
-        category_bucket["total"] += 1
-        if row["is_correct"]:
-            category_bucket["correct"] += 1
-        else:
-            incorrect_categories[category_name] = incorrect_categories.get(category_name, 0) + 1
-
-    overall_avg = sum(attempt_scores.values()) / len(attempt_scores) if attempt_scores else 0
+    overall_avg = recommendation_stats["score_sum"] / recommendation_stats["attempt_count"]
     topic_accuracy = [
         {"topic": topic, "accuracy": round((stats["correct"] / stats["total"]) * 100, 2), "questions_seen": stats["total"]}
-        for topic, stats in sorted(topic_stats.items())
+        for topic, stats in sorted(recommendation_stats["topic"].items())
         if stats["total"]
     ]
     topic_accuracy.sort(key=lambda item: item["accuracy"])
@@ -167,10 +193,15 @@ def build_ai_recommendation_payload(performance_rows):
 
     difficulty_analysis = {
         level: round((stats["correct"] / stats["total"]) * 100, 2)
-        for level, stats in difficulty_stats.items()
+        for level, stats in sorted(recommendation_stats["difficulty"].items(), key=lambda item: (DIFFICULTY_ORDER.get(item[0], len(DIFFICULTY_ORDER)), item[0]))
         if stats["total"]
     }
-    repeated_mistakes = [name for name, count in sorted(incorrect_categories.items(), key=lambda item: item[1], reverse=True) if count >= 2][:5]
+    missed_categories = sorted(
+        ((name, stats["total"] - stats["correct"], stats["last_missed_at"] or "") for name, stats in sorted(recommendation_stats["category"].items())),
+        key=lambda item: (item[1], item[2]),
+        reverse=True,
+    )
+    repeated_mistakes = [name for name, count, _last_missed_at in missed_categories if count >= 2][:5]
 
     recommendations = []
     for item in topic_accuracy[:3]:
@@ -786,60 +817,6 @@ def generate_resume_ai_chat_reply(resume_text, job_description_text, suggestions
         return generate_local_resume_ai_chat_reply(resume_text, job_description_text, suggestions, question, chat_history)
 
 
-TOPIC_CATEGORY_PATTERNS = {
-    "Aptitude": {
-        "Time & Work": ["work", "pipe", "tank", "days", "finish"],
-        "Percentages": ["percent", "%", "discount", "interest"],
-        "Speed & Distance": ["train", "speed", "distance", "km", "hours"],
-        "Average & Ratio": ["average", "ratio", "class", "boys", "girls"],
-    },
-    "Logical": {
-        "Series & Patterns": ["series", "next", "missing term"],
-        "Coding-Decoding": ["code", "coded", "written as"],
-        "Directions & Arrangements": ["east", "west", "north", "south", "row"],
-        "Syllogisms & Relations": ["all", "some", "related", "conclusion", "photograph"],
-    },
-    "Logical Reasoning": {
-        "Series & Patterns": ["series", "next", "missing term"],
-        "Coding-Decoding": ["code", "coded", "written as"],
-        "Directions & Arrangements": ["east", "west", "north", "south", "row"],
-        "Syllogisms & Relations": ["all", "some", "related", "conclusion", "photograph"],
-    },
-    "Verbal": {
-        "Grammar": ["grammar", "grammatically", "fill in the blank", "sentence", "verb"],
-        "Vocabulary": ["synonym", "antonym", "meaning", "word closest"],
-        "Usage & Idioms": ["idiom", "usage", "punctuation", "correctly spelled"],
-    },
-    "Verbal Ability": {
-        "Grammar": ["grammar", "grammatically", "fill in the blank", "sentence", "verb"],
-        "Vocabulary": ["synonym", "antonym", "meaning", "word closest"],
-        "Usage & Idioms": ["idiom", "usage", "punctuation", "correctly spelled"],
-    },
-    "DSA Basics": {
-        "Data Structures": ["stack", "queue", "heap", "hash", "tree"],
-        "Algorithms": ["sort", "search", "merge", "dfs", "bfs"],
-        "Complexity": ["complexity", "worst-case", "average-case", "o("],
-    },
-    "SQL": {
-        "Joins & Aggregation": ["join", "group", "having", "count", "sum", "max"],
-        "DDL & DML": ["alter", "update", "delete", "truncate", "insert"],
-        "Filtering & Keys": ["where", "like", "primary key", "distinct", "filter"],
-    },
-}
-
-
-def infer_topic_category(topic_name, question_text):
-    normalized = (question_text or "").lower()
-    topic_patterns = TOPIC_CATEGORY_PATTERNS.get(topic_name, {})
-    if not topic_patterns and topic_name in {"Logical Reasoning", "Verbal Ability"}:
-        fallback_topic = "Logical" if topic_name == "Logical Reasoning" else "Verbal"
-        topic_patterns = TOPIC_CATEGORY_PATTERNS.get(fallback_topic, {})
-    for category, patterns in topic_patterns.items():
-        if any(pattern in normalized for pattern in patterns):
-            return category
-    return topic_name
-
-
 def build_test_performance_feedback(test_label, topic_name, questions, answers, recommendation_pool=None):
     category_stats = {}
     difficulty_stats = {}
@@ -856,7 +833,7 @@ def build_test_performance_feedback(test_label, topic_name, questions, answers,
 
         difficulty = question.get("difficulty", "Medium")
         question_topic = question.get("section") or topic_name
-        category = infer_topic_category(question_topic, question.get("question_text", ""))
+        category = question.get("category") or infer_topic_category(question_topic, question.get("question_text", ""))
 
         category_bucket = category_stats.setdefault(category, {"correct": 0, "total": 0})
         category_bucket["total"] += 1